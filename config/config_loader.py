@@ -12,11 +12,21 @@ Usage:
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+import copy
+import mmap
 import os
 
 import yaml
 
+# Prefer the libyaml-backed C loader (5-10x faster parse); fall back to the
+# pure-Python SafeLoader when PyYAML was built without libyaml.
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 # ===============================
 # Exceptions
@@ -30,28 +40,57 @@ class ConfigError(Exception):
 # Core Loader
 # ===============================
 
-def load_config(path: str = "competition.yaml") -> Dict[str, Any]:
+# Parsed-config cache keyed by (abspath, mtime_ns, size).
+# Editing the yaml changes mtime/size, so stale entries invalidate themselves.
+_CFG_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+
+def load_config(path: str = "competition.yaml", mutate: bool = False) -> Dict[str, Any]:
     """
     Load YAML config file into a dict, validate required structure.
+
+    Results are cached per (path, mtime, size), so repeated calls in the
+    trading loop skip the YAML parse. Pass mutate=True to get a private
+    deep copy you are allowed to modify.
     """
     if not os.path.exists(path):
         raise ConfigError(f"Config file not found: {path}")
 
-    with open(path, "r", encoding="utf-8") as f:
-        cfg = yaml.safe_load(f)
+    st = os.stat(path)
+    cache_key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+    cfg = _CFG_CACHE.get(cache_key)
+    if cfg is None:
+        if st.st_size:
+            # Feed the parser straight from the page cache — no read buffer
+            with open(path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                        mm.madvise(mmap.MADV_WILLNEED)
+                    cfg = yaml.load(mm, Loader=_YamlLoader)
+        else:
+            cfg = None
 
-    if not isinstance(cfg, dict):
-        raise ConfigError("Config file must parse into a dictionary (YAML object).")
+        if not isinstance(cfg, dict):
+            raise ConfigError("Config file must parse into a dictionary (YAML object).")
 
-    validate_config(cfg)
+        validate_config(cfg)
+        _CFG_CACHE[cache_key] = cfg
 
-    return cfg
+    return copy.deepcopy(cfg) if mutate else cfg
 
 
 # ===============================
 # Helpers
 # ===============================
 
+@lru_cache(maxsize=512)
+def _split_path(dotted_key: str) -> Tuple[str, ...]:
+    """Memoized split — dotted keys are small constant literals in practice."""
+    return tuple(dotted_key.split("."))
+
+
 def cfg_get(cfg: Dict[str, Any], dotted_key: str, default: Optional[Any] = None) -> Any:
     """
     Get nested config keys using dotted path.
@@ -59,7 +98,7 @@ def cfg_get(cfg: Dict[str, Any], dotted_key: str, default: Optional[Any] = None)
     Example:
         cfg_get(cfg, "weex.symbol")
     """
-    parts = dotted_key.split(".")
+    parts = _split_path(dotted_key)
     current: Any = cfg
 
     for p in parts:
@@ -74,31 +113,41 @@ def cfg_get(cfg: Dict[str, Any], dotted_key: str, default: Optional[Any] = None)
 # Validation
 # ===============================
 
+REQUIRED_KEYS = (
+    "project.name",
+    "project.version",
+    "weex.base_url",
+    "weex.symbol",
+    "weex.leverage",
+    "bot.loop_seconds",
+    "risk_engine.limits.max_risk_per_trade",
+    "risk_engine.limits.max_position_size",
+    "risk_engine.limits.max_daily_drawdown",
+    "ai_log.enabled",
+    "backup.enabled",
+    "backup.folder",
+)
+
+# Pre-split once at import — validation walks tuples, not dotted strings
+_REQUIRED_PATHS = tuple(tuple(k.split(".")) for k in REQUIRED_KEYS)
+
+
 def validate_config(cfg: Dict[str, Any]) -> None:
     """
     Minimal validation that ensures critical config keys exist.
     Add more keys over time as your system grows.
     """
 
-    required_keys = [
-        "project.name",
-        "project.version",
-        "weex.base_url",
-        "weex.symbol",
-        "weex.leverage",
-        "bot.loop_seconds",
-        "risk_engine.limits.max_risk_per_trade",
-        "risk_engine.limits.max_position_size",
-        "risk_engine.limits.max_daily_drawdown",
-        "ai_log.enabled",
-        "backup.enabled",
-        "backup.folder"
-    ]
-
     missing = []
-    for k in required_keys:
-        if cfg_get(cfg, k) is None:
-            missing.append(k)
+    for dotted, parts in zip(REQUIRED_KEYS, _REQUIRED_PATHS):
+        current: Any = cfg
+        for p in parts:
+            if not isinstance(current, dict) or p not in current:
+                current = None
+                break
+            current = current[p]
+        if current is None:
+            missing.append(dotted)
 
     if missing:
         raise ConfigError(
@@ -8,9 +8,14 @@ Used for:
 - Auditable AI decisions + explainability
 """
 
-from typing import Dict, Any
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Dict, Any, Optional
 
-from regime_router import route
+import numpy as np
+import pandas as pd
+
+from regime_router import route, SIGNAL_KEYS
 
 
 # ===============================
@@ -22,29 +27,51 @@ def clamp(value: float, min_val: float = -1.0, max_val: float = 1.0) -> float:
 
 
 def safe_float(x: Any, default: float = 0.0) -> float:
+    # type-check fast path — no exception machinery when x is already numeric
+    t = type(x)
+    if t is float:
+        return x
+    if t is int:
+        return float(x)
+    if x is None:
+        return default
     try:
         return float(x)
-    except Exception:
+    except (TypeError, ValueError):
         return default
 
 
 def normalize_signals(signals: Dict[str, float]) -> Dict[str, float]:
-    return {k: clamp(v) for k, v in signals.items()}
+    # clamp inlined as conditional expressions — no per-key function call
+    return {k: -1.0 if v < -1.0 else 1.0 if v > 1.0 else v for k, v in signals.items()}
 
 
 # ===============================
 # Scoring + Explainability
 # ===============================
 
-def compute_score(signals: Dict[str, float], weights: Dict[str, float]) -> float:
-    score = 0.0
-    for name, value in signals.items():
-        score += weights.get(name, 0.0) * value
-    return score
+def _signal_vector(signals: Dict[str, float]) -> np.ndarray:
+    """Signals as a dense vector aligned to SIGNAL_KEYS."""
+    return np.array([signals.get(k, 0.0) for k in SIGNAL_KEYS], dtype=np.float64)
+
+
+def compute_score(signals: Dict[str, float], profile: Dict[str, Any]) -> float:
+    # Unrolled fixed-order kernel: for 4 signals, plain float arithmetic on
+    # the flat weight tuple beats building a numpy vector per call.
+    # (Batch scoring still uses the profile["_w"] matrix path.)
+    w = profile["_w_flat"]
+    get = signals.get
+    return (
+        w[0] * get("momentum", 0.0)
+        + w[1] * get("trend", 0.0)
+        + w[2] * get("volatility", 0.0)
+        + w[3] * get("sentiment", 0.0)
+    )
 
 
-def explain_decision(signals: Dict[str, float], weights: Dict[str, float]) -> Dict[str, float]:
-    return {name: round(value * weights.get(name, 0.0), 4) for name, value in signals.items()}
+def explain_decision(signals: Dict[str, float], profile: Dict[str, Any]) -> Dict[str, float]:
+    contrib = np.round(profile["_w"] * _signal_vector(signals), 4)
+    return dict(zip(SIGNAL_KEYS, contrib.tolist()))
 
 
 # ===============================
@@ -83,52 +110,84 @@ def signals_from_weex_ticker(ticker: Dict[str, Any]) -> Dict[str, float]:
 # Decision Engine (Regime-aware)
 # ===============================
 
-def make_decision(raw_signals: Dict[str, float], profile: Dict[str, Any]) -> Dict[str, object]:
+class Side(IntEnum):
+    """Trade side codes — int8-friendly for batch arrays."""
+    SELL = -1
+    HOLD = 0
+    BUY = 1
+
+
+# Categorical order for code -> label mapping (code + 1 indexes this)
+_SIDE_LABELS = ("SELL", "HOLD", "BUY")
+
+
+@dataclass(slots=True)
+class Decision:
+    """
+    Compact decision container for the hot path.
+
+    `explanation` is computed lazily — backtest loops that only consume
+    decision/score never pay for the per-signal contribution dict.
+    """
+    decision: str
+    confidence: float
+    score: float
+    signals: Dict[str, float]
+    profile: Dict[str, Any]
+    reason: Optional[str] = None
+
+    @property
+    def explanation(self) -> Dict[str, float]:
+        return explain_decision(self.signals, self.profile)
+
+    def as_dict(self) -> Dict[str, object]:
+        """Full dict shape (incl. explanation) for AI logs / JSON."""
+        out: Dict[str, object] = {
+            "decision": self.decision,
+            "confidence": self.confidence,
+            "score": self.score,
+            "signals": self.signals,
+            "explanation": self.explanation,
+        }
+        if self.reason is not None:
+            out["reason"] = self.reason
+        return out
+
+
+def make_decision(raw_signals: Dict[str, float], profile: Dict[str, Any]) -> Decision:
     signals = normalize_signals(raw_signals)
 
-    weights = profile["weights"]
     buy_th = float(profile["buy_threshold"])
     sell_th = float(profile["sell_threshold"])
     max_vol = float(profile["max_volatility"])
 
     # Regime risk gate
     if signals.get("volatility", 0.0) > max_vol:
-        return {
-            "decision": "HOLD",
-            "confidence": 0.0,
-            "reason": f"Volatility gate (vol>{max_vol})",
-            "score": 0.0,
-            "signals": signals,
-            "explanation": explain_decision(signals, weights),
-        }
+        return Decision(
+            decision="HOLD",
+            confidence=0.0,
+            score=0.0,
+            signals=signals,
+            profile=profile,
+            reason=f"Volatility gate (vol>{max_vol})",
+        )
 
-    score = compute_score(signals, weights)
+    score = compute_score(signals, profile)
 
     if score >= buy_th:
-        return {
-            "decision": "BUY",
-            "confidence": round(abs(score), 4),
-            "score": round(score, 4),
-            "signals": signals,
-            "explanation": explain_decision(signals, weights),
-        }
-
-    if score <= sell_th:
-        return {
-            "decision": "SELL",
-            "confidence": round(abs(score), 4),
-            "score": round(score, 4),
-            "signals": signals,
-            "explanation": explain_decision(signals, weights),
-        }
+        side = "BUY"
+    elif score <= sell_th:
+        side = "SELL"
+    else:
+        side = "HOLD"
 
-    return {
-        "decision": "HOLD",
-        "confidence": round(abs(score), 4),
-        "score": round(score, 4),
-        "signals": signals,
-        "explanation": explain_decision(signals, weights),
-    }
+    return Decision(
+        decision=side,
+        confidence=round(abs(score), 4),
+        score=round(score, 4),
+        signals=signals,
+        profile=profile,
+    )
 
 
 def generate_decision(ticker: Dict[str, Any]) -> Dict[str, object]:
@@ -140,7 +199,7 @@ def generate_decision(ticker: Dict[str, Any]) -> Dict[str, object]:
     profile = routing["profile"]
 
     signals = signals_from_weex_ticker(ticker)
-    out = make_decision(signals, profile)
+    out = make_decision(signals, profile).as_dict()
 
     # Attach regime metadata for AI log transparency + judges
     out["regime"] = routing["regime"]
@@ -150,6 +209,62 @@ def generate_decision(ticker: Dict[str, Any]) -> Dict[str, object]:
     return out
 
 
+# ===============================
+# Batch pipeline (backtests)
+# ===============================
+
+def generate_decisions_batch(df: pd.DataFrame, profile: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Vectorized version of signals_from_weex_ticker + make_decision for a
+    whole DataFrame of ticker rows (backtesting). One numpy pass instead
+    of a Python loop per row.
+
+    Expects columns: priceChangePercent, best_bid, best_ask, last.
+    """
+    change = pd.to_numeric(df["priceChangePercent"], errors="coerce").fillna(0.0).to_numpy(np.float64)
+    bid = pd.to_numeric(df["best_bid"], errors="coerce").fillna(0.0).to_numpy(np.float64)
+    ask = pd.to_numeric(df["best_ask"], errors="coerce").fillna(0.0).to_numpy(np.float64)
+    last = pd.to_numeric(df["last"], errors="coerce").fillna(0.0).to_numpy(np.float64)
+
+    momentum = np.clip(change / 0.02, -1.0, 1.0)
+    trend = np.clip(momentum * 0.9, -1.0, 1.0)
+
+    spread_pct = np.where(last != 0.0, np.abs(ask - bid) / np.where(last != 0.0, last, 1.0), 0.0)
+    volatility = np.clip(spread_pct * 200.0, -1.0, 1.0)
+
+    # Stack in SIGNAL_KEYS order (sentiment placeholder = 0) and score
+    signals = np.column_stack([momentum, trend, volatility, np.zeros_like(momentum)])
+    scores = signals @ profile["_w"]
+
+    # Regime risk gate: force HOLD-score when volatility exceeds the cap
+    max_vol = float(profile["max_volatility"])
+    scores = np.where(volatility > max_vol, 0.0, scores)
+
+    buy_th = float(profile["buy_threshold"])
+    sell_th = float(profile["sell_threshold"])
+
+    # int8 side codes (1 byte/row, single-instruction compares) — labels
+    # only materialize as a pandas Categorical at the output boundary
+    codes = np.where(
+        scores >= buy_th, np.int8(Side.BUY),
+        np.where(scores <= sell_th, np.int8(Side.SELL), np.int8(Side.HOLD)),
+    ).astype(np.int8)
+    decisions = pd.Categorical.from_codes(codes + 1, categories=list(_SIDE_LABELS))
+
+    return pd.DataFrame(
+        {
+            "decision": decisions,
+            "decision_code": codes,
+            "score": np.round(scores, 4),
+            "confidence": np.round(np.abs(scores), 4),
+            "momentum": momentum,
+            "trend": trend,
+            "volatility": volatility,
+        },
+        index=df.index,
+    )
+
+
 # ===============================
 # Local test
 # ===============================
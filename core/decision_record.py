@@ -12,18 +12,26 @@ Purpose:
 This file MUST NOT contain strategy logic.
 """
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field, fields, replace
 from typing import Optional, Dict
-from datetime import datetime
+from datetime import datetime, timezone
 import hashlib
 import json
+import time
+
+# orjson is C-implemented (~5-10x faster dumps, returns bytes directly);
+# fall back to stdlib json when it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 # ===============================
 # Decision Record Schema
 # ===============================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DecisionRecord:
     # Identity
     decision_id: str
@@ -50,6 +58,10 @@ class DecisionRecord:
     # Integrity
     decision_hash: Optional[str] = None
 
+    # Memoized JSON (records are frozen, so serialization is stable);
+    # underscore fields are excluded from hashing and serialization.
+    _serialized: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
 
 # ===============================
 # Factory
@@ -68,9 +80,12 @@ def create_decision_record(
     Create a new decision record before risk evaluation.
     """
 
-    timestamp = datetime.utcnow().isoformat()
-    raw_id = f"{symbol}:{timeframe}:{timestamp}"
-    decision_id = hashlib.sha256(raw_id.encode()).hexdigest()
+    # time_ns is a single syscall returning an int; the ISO string is only
+    # built once for the audit field, and the raw int feeds the id hash.
+    ts_ns = time.time_ns()
+    timestamp = datetime.fromtimestamp(ts_ns / 1e9, tz=timezone.utc).isoformat()
+    raw_id = b"%b:%b:%b" % (symbol.encode(), timeframe.encode(), ts_ns.to_bytes(8, "big"))
+    decision_id = hashlib.sha256(raw_id).hexdigest()
 
     record = DecisionRecord(
         decision_id=decision_id,
@@ -101,13 +116,12 @@ def attach_risk_outcome(
     Attach risk engine outcome to decision.
     """
 
-    updated = DecisionRecord(
-        **{
-            **asdict(record),
-            "approved": approved,
-            "position_size": position_size,
-            "rejection_reason": rejection_reason
-        }
+    # dataclasses.replace reuses field references — no recursive asdict copy
+    updated = replace(
+        record,
+        approved=approved,
+        position_size=position_size,
+        rejection_reason=rejection_reason
     )
 
     return attach_hash(updated)
@@ -122,18 +136,22 @@ def attach_hash(record: DecisionRecord) -> DecisionRecord:
     Create deterministic hash of the decision record.
     """
 
-    record_dict = asdict(record)
+    # Shallow field read — fields are flat primitives (plus the signals dict,
+    # which the JSON dump serializes as-is), so no asdict recursion needed.
+    record_dict = {
+        f.name: getattr(record, f.name)
+        for f in fields(record)
+        if not f.name.startswith("_")
+    }
     record_dict["decision_hash"] = None  # exclude hash from hash
 
-    serialized = json.dumps(record_dict, sort_keys=True)
-    decision_hash = hashlib.sha256(serialized.encode()).hexdigest()
+    if orjson is not None:
+        serialized = orjson.dumps(record_dict, option=orjson.OPT_SORT_KEYS)
+    else:
+        serialized = json.dumps(record_dict, sort_keys=True).encode()
+    decision_hash = hashlib.sha256(serialized).hexdigest()
 
-    return DecisionRecord(
-        **{
-            **record_dict,
-            "decision_hash": decision_hash
-        }
-    )
+    return replace(record, decision_hash=decision_hash)
 
 
 # ===============================
@@ -141,11 +159,25 @@ def attach_hash(record: DecisionRecord) -> DecisionRecord:
 # ===============================
 
 def to_dict(record: DecisionRecord) -> Dict:
-    return asdict(record)
+    return {
+        f.name: getattr(record, f.name)
+        for f in fields(record)
+        if not f.name.startswith("_")
+    }
 
 
 def to_json(record: DecisionRecord) -> str:
-    return json.dumps(asdict(record), indent=2)
+    # Records are frozen, so cache the JSON on first emission — the audit
+    # pipeline serializes the same record for stdout, file log and upload.
+    cached = record._serialized
+    if cached is None:
+        record_dict = to_dict(record)
+        if orjson is not None:
+            cached = orjson.dumps(record_dict, option=orjson.OPT_INDENT_2).decode()
+        else:
+            cached = json.dumps(record_dict, indent=2)
+        object.__setattr__(record, "_serialized", cached)
+    return cached
 
 
 # ===============================
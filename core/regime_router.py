@@ -13,10 +13,26 @@ Tuned to:
 from __future__ import annotations
 
 from dataclasses import dataclass
+from enum import IntEnum
+from types import MappingProxyType
 from typing import Dict, Any
 import numpy as np
 import pandas as pd
 
+# scipy's lfilter runs the EMA recurrence as a C loop; fall back to
+# pandas ewm when scipy is not installed.
+try:
+    from scipy.signal import lfilter as _lfilter
+except ImportError:
+    _lfilter = None
+
+# numba fuses the whole ADX pipeline into one native-code pass; the numpy
+# path below stays as fallback when numba is not installed.
+try:
+    from numba import njit as _njit
+except ImportError:
+    _njit = None
+
 
 # =========================
 # CONFIG (BTC-TUNED)
@@ -58,21 +74,118 @@ class RegimeResult:
 # INDICATORS
 # =========================
 
+def _rolling_mean(x: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average via cumsum — one pass, no pandas dispatch."""
+    out = np.full(x.shape, np.nan)
+    cs = np.cumsum(x)
+    out[period - 1:] = (cs[period - 1:] - np.concatenate(([0.0], cs[:-period]))) / period
+    return out
+
+
 def _ema(series: pd.Series, span: int) -> pd.Series:
-    return series.ewm(span=span, adjust=False).mean()
+    if _lfilter is None:
+        return series.ewm(span=span, adjust=False).mean()
+
+    alpha = 2.0 / (span + 1.0)
+    x = series.to_numpy(np.float64)
+    # zi seeds the recurrence so y[0] == x[0] (matches ewm(adjust=False))
+    y, _ = _lfilter([alpha], [1.0, -(1.0 - alpha)], x, zi=[x[0] * (1.0 - alpha)])
+    return pd.Series(y, index=series.index)
 
 
 def _true_range(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
-    prev_close = close.shift(1)
-    tr1 = (high - low).abs()
-    tr2 = (high - prev_close).abs()
-    tr3 = (low - prev_close).abs()
-    return pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    h = high.to_numpy(np.float64)
+    l = low.to_numpy(np.float64)
+    c = close.to_numpy(np.float64)
+
+    prev_c = np.empty_like(c)
+    prev_c[0] = np.nan
+    prev_c[1:] = c[:-1]
+
+    # fmax ignores the NaN on the first bar — no intermediate DataFrame
+    tr = np.fmax.reduce([np.abs(h - l), np.abs(h - prev_c), np.abs(l - prev_c)])
+    return pd.Series(tr, index=high.index)
 
 
 def _atr(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
     tr = _true_range(high, low, close)
-    return tr.rolling(period).mean()
+    return pd.Series(_rolling_mean(tr.to_numpy(np.float64), period), index=high.index)
+
+
+def _wilder_ema(x: np.ndarray, period: int) -> np.ndarray:
+    """Wilder smoothing (alpha = 1/period) as a single native-code pass."""
+    out = np.empty_like(x)
+    alpha = 1.0 / period
+    out[0] = x[0]
+    for i in range(1, x.shape[0]):
+        out[i] = out[i - 1] + alpha * (x[i] - out[i - 1])
+    return out
+
+
+def _adx_core(h: np.ndarray, l: np.ndarray, c: np.ndarray, period: int) -> np.ndarray:
+    """
+    Fused ADX kernel: TR, +DM, -DM, DI, DX and ADX in single passes with
+    running window sums — no intermediate pandas objects.
+    Matches the numpy fallback in _adx numerically.
+    """
+    n = h.shape[0]
+    tr = np.empty(n)
+    pdm = np.empty(n)
+    mdm = np.empty(n)
+
+    tr[0] = abs(h[0] - l[0])
+    pdm[0] = 0.0
+    mdm[0] = 0.0
+    for i in range(1, n):
+        hl = abs(h[i] - l[i])
+        hc = abs(h[i] - c[i - 1])
+        lc = abs(l[i] - c[i - 1])
+        t = hl
+        if hc > t:
+            t = hc
+        if lc > t:
+            t = lc
+        tr[i] = t
+
+        up = h[i] - h[i - 1]
+        dn = l[i - 1] - l[i]
+        pdm[i] = up if (up > dn and up > 0.0) else 0.0
+        mdm[i] = dn if (dn > up and dn > 0.0) else 0.0
+
+    # DX via running window sums (the /period in DI cancels out)
+    dx = np.zeros(n)
+    s_tr = 0.0
+    s_p = 0.0
+    s_m = 0.0
+    for i in range(n):
+        s_tr += tr[i]
+        s_p += pdm[i]
+        s_m += mdm[i]
+        if i >= period:
+            s_tr -= tr[i - period]
+            s_p -= pdm[i - period]
+            s_m -= mdm[i - period]
+        if i >= period - 1 and s_tr != 0.0:
+            pdi = 100.0 * s_p / s_tr
+            mdi = 100.0 * s_m / s_tr
+            den = pdi + mdi
+            if den != 0.0:
+                dx[i] = 100.0 * abs(pdi - mdi) / den
+
+    adx = np.full(n, np.nan)
+    s_dx = 0.0
+    for i in range(n):
+        s_dx += dx[i]
+        if i >= period:
+            s_dx -= dx[i - period]
+        if i >= period - 1:
+            adx[i] = s_dx / period
+    return adx
+
+
+if _njit is not None:
+    _wilder_ema = _njit(cache=True, fastmath=True)(_wilder_ema)
+    _adx_core = _njit(cache=True, fastmath=True)(_adx_core)
 
 
 def _adx(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
@@ -80,16 +193,172 @@ def _adx(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) ->
     Classic ADX implementation.
     Returns ADX series.
     """
-    up_move = high.diff()
-    down_move = -low.diff()
+    if _njit is not None:
+        adx = _adx_core(
+            high.to_numpy(np.float64),
+            low.to_numpy(np.float64),
+            close.to_numpy(np.float64),
+            period,
+        )
+        return pd.Series(adx, index=high.index)
+
+    h = high.to_numpy(np.float64)
+    l = low.to_numpy(np.float64)
+
+    up_move = np.empty_like(h)
+    up_move[0] = np.nan
+    up_move[1:] = h[1:] - h[:-1]
+
+    down_move = np.empty_like(l)
+    down_move[0] = np.nan
+    down_move[1:] = l[:-1] - l[1:]
 
     plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
     minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
 
-    tr = _true_range(high, low, close)
-    atr = tr.rolling(period).mean()
+    tr = _true_range(high, low, close).to_numpy(np.float64)
+    atr = _rolling_mean(tr, period)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = 100.0 * _rolling_mean(plus_dm, period) / atr
+        minus_di = 100.0 * _rolling_mean(minus_dm, period) / atr
+        dx = np.nan_to_num(100.0 * np.abs(plus_di - minus_di) / (plus_di + minus_di))
+
+    adx = _rolling_mean(dx, period)
+    return pd.Series(adx, index=high.index)
+
+
+# =========================
+# STRATEGY PROFILES
+# =========================
+
+# Canonical signal order — shared with decision_engine scoring.
+SIGNAL_KEYS = ("momentum", "trend", "volatility", "sentiment")
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    # Clean momentum days: lean into trend, tolerate some vol
+    "TREND_FOLLOW": {
+        "weights": {"momentum": 0.45, "trend": 0.35, "volatility": -0.10, "sentiment": 0.10},
+        "buy_threshold": 0.25,
+        "sell_threshold": -0.25,
+        "max_volatility": 0.85,
+    },
+    # Chop / range: demand stronger conviction before trading
+    "RANGE": {
+        "weights": {"momentum": 0.30, "trend": 0.20, "volatility": -0.30, "sentiment": 0.20},
+        "buy_threshold": 0.40,
+        "sell_threshold": -0.40,
+        "max_volatility": 0.60,
+    },
+    # Dangerous vol: near-impossible thresholds -> effectively HOLD
+    "DEFEND": {
+        "weights": {"momentum": 0.20, "trend": 0.15, "volatility": -0.45, "sentiment": 0.20},
+        "buy_threshold": 0.60,
+        "sell_threshold": -0.60,
+        "max_volatility": 0.40,
+    },
+}
+
+# Precompute a weight vector per profile aligned to SIGNAL_KEYS so scoring
+# is a single dot product instead of per-key dict lookups. Profiles are
+# immutable configuration — freeze them so callers share references
+# instead of copying, and accidental writes fail loudly.
+for _name, _profile in list(PROFILES.items()):
+    _profile["name"] = _name
+    _profile["_w"] = np.array(
+        [_profile["weights"][k] for k in SIGNAL_KEYS], dtype=np.float64
+    )
+    # flat tuple for the scalar hot path — unrolled arithmetic, no array alloc
+    _profile["_w_flat"] = tuple(_profile["_w"].tolist())
+    PROFILES[_name] = MappingProxyType(_profile)
+
+
+# =========================
+# TICKER-BASED ROUTING (live loop)
+# =========================
+
+def _safe_float(x: Any, default: float = 0.0) -> float:
+    # type-check fast path — no exception machinery when x is already numeric
+    t = type(x)
+    if t is float:
+        return x
+    if t is int:
+        return float(x)
+    if x is None:
+        return default
+    try:
+        return float(x)
+    except (TypeError, ValueError):
+        return default
+
+
+def detect_regime_from_ticker(ticker: Dict[str, Any]) -> str:
+    """
+    Lightweight regime classification from a single WEEX ticker snapshot
+    (no candle history needed in the live loop).
+    """
+    change_24h = abs(_safe_float(ticker.get("priceChangePercent"), 0.0))
+    last = _safe_float(ticker.get("last"), 0.0)
+    best_ask = _safe_float(ticker.get("best_ask") or ticker.get("bestAsk"), 0.0)
+    best_bid = _safe_float(ticker.get("best_bid") or ticker.get("bestBid"), 0.0)
+
+    spread = abs(best_ask - best_bid) if best_ask and best_bid else 0.0
+    spread_pct = (spread / last) if last else 0.0
+
+    if change_24h >= 0.03 or spread_pct >= 3e-4:
+        return "HIGH_VOL"
+    if change_24h >= 0.012:
+        return "TREND"
+    return "RANGE"
+
+
+def select_profile(regime: str) -> Dict[str, Any]:
+    """Map detected regime to its strategy profile."""
+    if regime == "TREND":
+        return PROFILES["TREND_FOLLOW"]
+    if regime == "RANGE":
+        return PROFILES["RANGE"]
+    return PROFILES["DEFEND"]
+
+
+class Regime(IntEnum):
+    """Regime codes — compare as ints internally, .name at the boundary."""
+    HIGH_VOL = 0
+    TREND = 1
+    RANGE = 2
+
+
+# Classification as a direct index lookup (0=HIGH_VOL, 1=TREND, 2=RANGE)
+# instead of string compares + a second dispatch through select_profile.
+_REGIME_NAMES = tuple(r.name for r in Regime)
+_REGIME_PROFILES = (PROFILES["DEFEND"], PROFILES["TREND_FOLLOW"], PROFILES["RANGE"])
+
+
+def route(ticker: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Full live-loop routing:
+    ticker -> regime -> strategy profile
+    """
+    change_24h = abs(_safe_float(ticker.get("priceChangePercent"), 0.0))
+    last = _safe_float(ticker.get("last"), 0.0)
+    best_ask = _safe_float(ticker.get("best_ask") or ticker.get("bestAsk"), 0.0)
+    best_bid = _safe_float(ticker.get("best_bid") or ticker.get("bestBid"), 0.0)
+
+    spread = abs(best_ask - best_bid) if best_ask and best_bid else 0.0
+    spread_pct = (spread / last) if last else 0.0
 
-    plus_di = 100 * pd.Series(plus_dm, index=high.index).rolling(period).mean() / atr
-    minus_di = 100 * pd.Series(minus_dm, index=high.index).rolling(period).mean() / atr
+    if change_24h >= 0.03 or spread_pct >= 3e-4:
+        idx = 0
+    elif change_24h >= 0.012:
+        idx = 1
+    else:
+        idx = 2
 
-    dx = (100 * (
+    return {
+        "regime": _REGIME_NAMES[idx],
+        "profile": _REGIME_PROFILES[idx],
+        "metrics": {
+            "change_24h": _safe_float(ticker.get("priceChangePercent"), 0.0),
+            "last": last,
+        },
+    }
@@ -10,8 +10,16 @@ Used for:
 - Deterministic risk control
 """
 
+from dataclasses import dataclass
 from typing import Dict
 
+# numba compiles the scalar risk math to native code; the same function
+# runs as plain Python when numba is not installed.
+try:
+    from numba import njit as _njit
+except ImportError:
+    _njit = None
+
 
 # ===============================
 # Risk Parameters
@@ -27,10 +35,14 @@ MIN_CONFIDENCE = 0.20         # ignore weak signals
 # Risk State (in-memory MVP)
 # ===============================
 
-risk_state = {
-    "daily_pnl": 0.0,
-    "open_exposure": 0.0
-}
+@dataclass(slots=True)
+class RiskState:
+    daily_pnl: float = 0.0
+    open_exposure: float = 0.0
+
+
+# slot attribute loads — no dict hashing on every pnl/exposure update
+risk_state = RiskState()
 
 
 # ===============================
@@ -49,7 +61,7 @@ def check_drawdown() -> bool:
     """
     Block trading if daily drawdown breached.
     """
-    return abs(risk_state["daily_pnl"]) < MAX_DAILY_DRAWDOWN
+    return abs(risk_state.daily_pnl) < MAX_DAILY_DRAWDOWN
 
 
 def check_confidence(confidence: float) -> bool:
@@ -64,7 +76,7 @@ def check_exposure(equity: float, new_position_size: float) -> bool:
     Prevent over-leveraging.
     """
     max_allowed = equity * MAX_POSITION_SIZE
-    return (risk_state["open_exposure"] + new_position_size) <= max_allowed
+    return (risk_state.open_exposure + new_position_size) <= max_allowed
 
 
 # ===============================
@@ -83,10 +95,54 @@ def calculate_position_size(
     return round(size, 2)
 
 
+# ===============================
+# Risk Core (scalar kernel)
+# ===============================
+
+def _risk_core(equity: float, confidence: float, open_exposure: float, daily_pnl: float):
+    """
+    All scalar risk math in one branch-cheap pass.
+    Returns (code, position_size):
+    0 = approved, 1 = low confidence, 2 = drawdown breached, 3 = exposure exceeded
+    """
+    if confidence < MIN_CONFIDENCE:
+        return 1, 0.0
+
+    if abs(daily_pnl) >= MAX_DAILY_DRAWDOWN:
+        return 2, 0.0
+
+    c = confidence
+    if c < 0.0:
+        c = 0.0
+    elif c > 1.0:
+        c = 1.0
+    size = round(equity * MAX_RISK_PER_TRADE * c, 2)
+
+    if open_exposure + size > equity * MAX_POSITION_SIZE:
+        return 3, 0.0
+
+    return 0, size
+
+
+if _njit is not None:
+    _risk_core = _njit(cache=True, fastmath=True)(_risk_core)
+
+
 # ===============================
 # Risk Gatekeeper
 # ===============================
 
+# Rejection results are identical every time — return shared references
+# instead of allocating a fresh dict per HOLD (the majority case in chop).
+_HOLD_RESULT = {"approved": False, "reason": "No trade decision"}
+_LOW_CONFIDENCE_RESULT = {"approved": False, "reason": "Low confidence signal"}
+_DRAWDOWN_RESULT = {"approved": False, "reason": "Daily drawdown limit breached"}
+_EXPOSURE_RESULT = {"approved": False, "reason": "Exposure limit exceeded"}
+
+# _risk_core rejection code -> cached result (index 0 = approved, unused)
+_REJECTIONS = (None, _LOW_CONFIDENCE_RESULT, _DRAWDOWN_RESULT, _EXPOSURE_RESULT)
+
+
 def approve_trade(
     decision_payload: Dict[str, object],
     equity: float
@@ -96,21 +152,19 @@ def approve_trade(
     """
 
     decision = decision_payload.get("decision")
-    confidence = decision_payload.get("confidence", 0.0)
-
-    if decision == "HOLD":
-        return {"approved": False, "reason": "No trade decision"}
+    if decision is None or decision == "HOLD":
+        return _HOLD_RESULT
 
-    if not check_confidence(confidence):
-        return {"approved": False, "reason": "Low confidence signal"}
-
-    if not check_drawdown():
-        return {"approved": False, "reason": "Daily drawdown limit breached"}
-
-    position_size = calculate_position_size(equity, confidence)
+    confidence = decision_payload.get("confidence", 0.0)
 
-    if not check_exposure(equity, position_size):
-        return {"approved": False, "reason": "Exposure limit exceeded"}
+    code, position_size = _risk_core(
+        float(equity),
+        float(confidence),
+        float(risk_state.open_exposure),
+        float(risk_state.daily_pnl),
+    )
+    if code:
+        return _REJECTIONS[code]
 
     return {
         "approved": True,
@@ -128,16 +182,16 @@ def update_after_trade(pnl: float, position_size: float):
     """
     Update risk state after trade closes.
     """
-    risk_state["daily_pnl"] += pnl
-    risk_state["open_exposure"] -= position_size
-    risk_state["open_exposure"] = max(risk_state["open_exposure"], 0.0)
+    risk_state.daily_pnl += pnl
+    risk_state.open_exposure -= position_size
+    risk_state.open_exposure = max(risk_state.open_exposure, 0.0)
 
 
 def register_open_trade(position_size: float):
     """
     Track open exposure.
     """
-    risk_state["open_exposure"] += position_size
+    risk_state.open_exposure += position_size
 
 
 # ===============================
@@ -0,0 +1,276 @@
+"""
+OmniQuantAI - WEEX AI Logger
+===========================
+
+Uploads AI decision logs to WEEX:
+POST /capi/v2/order/uploadAiLog
+
+WEEX requires:
+- model
+- input (JSON)
+- output (JSON)
+- explanation (<= 1000 chars)
+- orderId (optional)
+
+This logger is judge-friendly:
+✅ regime routing transparency
+✅ decision score + explanation
+✅ order execution details
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from weex.client import WEEXClient
+
+log = logging.getLogger(__name__)
+
+
+# ============================================================
+# Helpers
+# ============================================================
+
+def _safe_str(x: Any, max_len: int = 350) -> str:
+    # skip the str() allocation when x already is one (common case)
+    s = x if type(x) is str else str(x)
+    if len(s) > max_len:
+        return s[:max_len] + "…"
+    return s
+
+
+_TRUNC_CHAR = "…"
+
+
+def _truncate(text: str, max_len: int = 1000) -> str:
+    if not text:
+        return ""
+    if len(text) <= max_len:
+        return text
+    # f-string fuses slice + ellipsis into one allocation (no '+' temporary)
+    return f"{text[:max_len - 1]}{_TRUNC_CHAR}"
+
+
+# Fixed payload key sets — summaries are built with one dict-from-iterator
+# pass per section instead of nested literals re-keyed on every call.
+_ROUTER_KEYS = ("regime", "confidence", "trend_score", "chop_score", "vol_score", "thresholds")
+_EXECUTION_KEYS = ("side", "size", "leverage", "order_response")
+
+
+# ============================================================
+# Async upload queue
+# ============================================================
+
+class AILogQueue:
+    """
+    Decouples AI log uploads from the trading loop.
+
+    Uploads are appended to a crash-safe JSONL journal, enqueued, and
+    drained by a background daemon thread — the main loop pays only for
+    the enqueue instead of a full HTTP round-trip per order.
+    """
+
+    def __init__(self, journal_path: str = "logs/ai_log_journal.jsonl", maxsize: int = 256):
+        self.journal_path = journal_path
+        # bounded so a dead upload endpoint cannot grow memory without end
+        self._q: "queue.Queue" = queue.Queue(maxsize=maxsize)
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(
+                        target=self._drain, name="ai-log-upload", daemon=True
+                    )
+                    self._worker.start()
+
+    def _journal(self, payload: Dict[str, Any]) -> None:
+        try:
+            folder = os.path.dirname(self.journal_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(payload, separators=(",", ":"), default=str) + "\n")
+        except Exception as e:
+            log.warning("⚠️ AI log journal write failed: %s", e)
+
+    def put(self, client: WEEXClient, payload: Dict[str, Any]) -> None:
+        # journal first so nothing is lost if we crash before the drain
+        self._journal(payload)
+        try:
+            # never block the trading loop — drop (journaled) on overflow
+            self._q.put_nowait((client, payload))
+        except queue.Full:
+            log.warning("⚠️ AI log queue full — dropping upload (kept in journal)")
+            return
+        self._ensure_worker()
+
+    def _drain(self) -> None:
+        while True:
+            client, payload = self._q.get()
+            try:
+                resp = client.private_post("/capi/v2/order/uploadAiLog", payload)
+                log.info("✅ AI Log Uploaded: %s", resp)
+            except Exception as e:
+                log.warning("⚠️ AI log upload failed (async): %s", e)
+            finally:
+                self._q.task_done()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until all queued uploads finish (e.g. at shutdown).
+        Returns False if the timeout expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._q.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+
+# Shared queue — one drain thread per process is plenty
+_UPLOAD_QUEUE = AILogQueue()
+
+# Disabled-mode result is identical every time — shared reference, no
+# per-call dict allocation when logging is off (dev / backtest mode).
+_DISABLED_RESULT = {"code": "SKIPPED", "msg": "ai_log disabled", "data": None}
+
+
+# ============================================================
+# AI Logger
+# ============================================================
+
+class AILogger:
+    """
+    Build + Upload WEEX AI logs.
+
+    Use pattern:
+        logger = AILogger(model_name="OmniQuantAI-v0.1", default_stage="Decision Making")
+        payload = logger.build_payload(...)
+        logger.upload(client, payload)
+    """
+
+    # slot loads instead of per-access __dict__ probes; also drops the
+    # per-instance dict (~100 bytes each)
+    __slots__ = ("model_name", "default_stage", "enabled", "_prompt", "_envelope")
+
+    def __init__(
+        self,
+        model_name: str = "OmniQuantAI-v0.1",
+        default_stage: str = "Decision Making",
+        enabled: bool = True,
+    ):
+        self.model_name = model_name
+        self.default_stage = default_stage
+        self.enabled = enabled
+        # built once — build_payload reuses the same str object every call
+        self._prompt = (
+            "Classify regime (trend/chop/vol) and output a BUY/SELL/HOLD "
+            "decision for WEEX futures execution."
+        )
+        # constant payload fields for the whole run — copied, not rebuilt,
+        # per payload
+        self._envelope = {"stage": default_stage, "model": model_name}
+
+    def build_payload(
+        self,
+        *,
+        order_id: Optional[int],
+        router: Dict[str, Any],
+        decision: Dict[str, Any],
+        execution: Dict[str, Any],
+        stage: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Returns WEEX-compliant JSON payload.
+        """
+
+        symbol = str(execution.get("symbol") or router.get("symbol") or "UNKNOWN")
+
+        # ----------------------------
+        # Inputs (what AI saw)
+        # ----------------------------
+        router_summary = {k: router.get(k) for k in _ROUTER_KEYS}
+        router_summary["why"] = router.get("why") or router.get("reason")
+
+        ai_input = {
+            "prompt": self._prompt,
+            "symbol": symbol,
+            "router": router_summary,
+            "market": execution.get("ticker", {}),
+        }
+
+        # ----------------------------
+        # Outputs (what AI decided)
+        # ----------------------------
+        execution_summary = {k: execution.get(k) for k in _EXECUTION_KEYS}
+        execution_summary["executed"] = bool(order_id)
+        execution_summary["orderId"] = order_id
+
+        ai_output = {
+            "signal": decision.get("decision"),  # BUY / SELL / HOLD
+            "confidence": decision.get("confidence"),
+            "score": decision.get("score"),
+            "signal_contributions": decision.get("explanation"),
+            "signals_raw": decision.get("signals"),
+            "execution": execution_summary,
+        }
+
+        # ----------------------------
+        # Judge-facing explanation (<= 1000 chars)
+        # ----------------------------
+        parts = [
+            f"RegimeRouter={router_summary.get('regime')} "
+            f"(trend={router_summary.get('trend_score')}, chop={router_summary.get('chop_score')}, "
+            f"vol={router_summary.get('vol_score')}, conf={router_summary.get('confidence')}). ",
+            f"Decision={ai_output.get('signal')} score={ai_output.get('score')} conf={ai_output.get('confidence')}. ",
+            f"Contrib={_safe_str(ai_output.get('signal_contributions'), 300)}. ",
+        ]
+
+        if order_id:
+            parts.append(f"Order executed on WEEX. orderId={order_id}.")
+        else:
+            parts.append("No order executed.")
+
+        # join allocates the final string once — no quadratic += growth
+        explanation = _truncate("".join(parts), 1000)
+
+        payload: Dict[str, Any] = dict(self._envelope)  # stage + model
+        if stage is not None:
+            payload["stage"] = stage
+        payload["orderId"] = order_id  # optional
+        payload["input"] = ai_input
+        payload["output"] = ai_output
+        payload["explanation"] = explanation
+
+        return payload
+
+    def upload(self, *, client: WEEXClient, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Queue payload for async upload (journaled + background thread) —
+        the trading loop is never blocked on the HTTP round-trip.
+        """
+        if not self.enabled:
+            return _DISABLED_RESULT
+
+        # lazy %s formatting — no string build when the level is filtered out
+        log.info(
+            "🧾 Queueing AI Log stage=%s orderId=%s model=%s",
+            payload.get("stage"), payload.get("orderId"), payload.get("model"),
+        )
+
+        _UPLOAD_QUEUE.put(client, payload)
+        return {"code": "QUEUED", "msg": "ai_log queued for upload", "data": None}
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for queued uploads to drain (call at shutdown)."""
+        return _UPLOAD_QUEUE.flush(timeout)
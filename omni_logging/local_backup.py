@@ -18,6 +18,21 @@ from typing import Dict, Any, Optional
 import json
 import time
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dump_compact(payload: Dict[str, Any]) -> bytes:
+    """Compact JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(
+            payload,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+
 
 # ===============================
 # Utilities
@@ -31,9 +46,15 @@ def _truncate(text: str, max_len: int = 1000) -> str:
 
 
 def _safe_float(x: Any, default: float = 0.0) -> float:
+    # fast-path the common types before paying for float() dispatch
+    t = type(x)
+    if t is float:
+        return x
+    if t is int:
+        return float(x)
     try:
         return float(x)
-    except Exception:
+    except (TypeError, ValueError):
         return default
 
 
@@ -103,9 +124,18 @@ def build_ai_log_from_decision_record(
     - approved, position_size, rejection_reason (optional)
     """
 
-    symbol = str(decision_record.get("symbol", ""))
-    decision = str(decision_record.get("decision", "HOLD"))
-    confidence = float(decision_record.get("confidence", 0.0))
+    # Canonical records (decision_record.py) always carry these keys —
+    # direct indexing is one C-level hash lookup vs a .get method call.
+    # Malformed/partial records fall back to the defaulted path.
+    try:
+        symbol = str(decision_record["symbol"])
+        decision = str(decision_record["decision"])
+        confidence = float(decision_record["confidence"])
+    except (KeyError, TypeError):
+        symbol = str(decision_record.get("symbol", ""))
+        decision = str(decision_record.get("decision", "HOLD"))
+        confidence = float(decision_record.get("confidence", 0.0))
+
     signals = decision_record.get("signals") or {}
     price = decision_record.get("price")
 
@@ -172,12 +202,13 @@ def upload_ai_log(
 
     path = "/capi/v2/order/uploadAiLog"
 
-    print("\n🧠 Uploading WEEX AI Log")
-    print("➡️ Endpoint:", path)
-    print("➡️ orderId:", ai_log_payload.get("orderId"))
-    print("➡️ stage:", ai_log_payload.get("stage"))
-    print("➡️ model:", ai_log_payload.get("model"))
-    print("➡️ payload:", json.dumps(ai_log_payload, separators=(",", ":")))
+    # single print, and no full-payload serialization just for stdout
+    print(
+        f"\n🧠 Uploading WEEX AI Log endpoint={path} "
+        f"orderId={ai_log_payload.get('orderId')} "
+        f"stage={ai_log_payload.get('stage')} "
+        f"model={ai_log_payload.get('model')}"
+    )
 
     status, text = client.private_post(path, body=ai_log_payload)
 
@@ -16,8 +16,13 @@ Run:
 
 from __future__ import annotations
 
+import json
+import logging
+import signal
+import threading
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 
 # --- core strategy ---
@@ -30,7 +35,7 @@ from weex.position_manager import PositionManager
 from weex.execution_engine import ExecutionEngine, ExecutionConfig
 
 # --- logging ---
-from logging.ai_logger import AILogger
+from omni_logging.ai_logger import AILogger
 
 # --- config ---
 from config.config_loader import load_config, cfg_get
@@ -40,31 +45,95 @@ from config.config_loader import load_config, cfg_get
 # Helpers
 # ============================================================
 
-def safe_sleep(seconds: int):
-    for _ in range(int(seconds)):
-        time.sleep(1)
+# Set on shutdown — cuts any in-progress pause short immediately
+_STOP = threading.Event()
+
+# Kill switch: atomic cross-thread flag checked each iteration and before
+# any order goes out. A monitor thread / CLI / webhook can engage it
+# without touching the loop.
+_KILL = threading.Event()
+
+
+def engage_kill_switch():
+    """Stop trading as soon as the loop next checks the flag."""
+    _KILL.set()
+    _STOP.set()
+
+
+def safe_sleep(seconds: float):
+    # single interruptible wait instead of N one-second sleeps
+    _STOP.wait(seconds)
 
 
 def _safe_float(x, default=0.0) -> float:
+    # type-check fast path — no exception machinery when x is already numeric
+    t = type(x)
+    if t is float:
+        return x
+    if t is int:
+        return float(x)
+    if x is None:
+        return float(default)
     try:
         return float(x)
-    except Exception:
+    except (TypeError, ValueError):
         return float(default)
 
 
+# Fixed shape of the per-loop market snapshot kept for logs
+_TICKER_KEYS = (
+    "symbol",
+    "last",
+    "best_bid",
+    "best_ask",
+    "markPrice",
+    "indexPrice",
+    "volume_24h",
+    "priceChangePercent",
+    "timestamp",
+)
+
+
 def _ticker_min(ticker: Dict[str, Any]) -> Dict[str, Any]:
     """Keep only important market fields for logs."""
-    return {
-        "symbol": ticker.get("symbol"),
-        "last": ticker.get("last"),
-        "best_bid": ticker.get("best_bid"),
-        "best_ask": ticker.get("best_ask"),
-        "markPrice": ticker.get("markPrice"),
-        "indexPrice": ticker.get("indexPrice"),
-        "volume_24h": ticker.get("volume_24h"),
-        "priceChangePercent": ticker.get("priceChangePercent"),
-        "timestamp": ticker.get("timestamp"),
-    }
+    return {k: ticker.get(k) for k in _TICKER_KEYS}
+
+
+# Leverage survives restarts on the exchange side — remember what we set
+# so container/competition restarts skip the redundant HTTPS POST.
+_LEVERAGE_CACHE_PATH = "/tmp/omniquant_leverage.json"
+_LEVERAGE_CACHE_TTL = 3600
+
+
+def _leverage_cache_valid(symbol: str, leverage: int) -> bool:
+    try:
+        with open(_LEVERAGE_CACHE_PATH, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        return (
+            cached.get("symbol") == symbol
+            and cached.get("leverage") == leverage
+            and (time.time() - float(cached.get("ts", 0))) < _LEVERAGE_CACHE_TTL
+        )
+    except Exception:
+        return False
+
+
+def _write_leverage_cache(symbol: str, leverage: int) -> None:
+    try:
+        with open(_LEVERAGE_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"symbol": symbol, "leverage": leverage, "ts": time.time()}, f)
+    except Exception:
+        pass  # cache is best-effort — next restart just re-sets leverage
+
+
+def _ticker_key(ticker: Dict[str, Any]) -> tuple:
+    """Fields that drive routing + decision — the decision-cache key."""
+    return (
+        ticker.get("last"),
+        ticker.get("best_bid"),
+        ticker.get("best_ask"),
+        ticker.get("priceChangePercent"),
+    )
 
 
 # ============================================================
@@ -72,6 +141,10 @@ def _ticker_min(ticker: Dict[str, Any]) -> Dict[str, Any]:
 # ============================================================
 
 def main():
+    # weex/omni_logging modules log through stdlib logging (NullHandler by
+    # default) — install the live handler here so their trace is visible
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     cfg = load_config("competition.yaml")
 
     # --- WEEX settings ---
@@ -88,6 +161,8 @@ def main():
     ai_log_enabled = bool(cfg_get(cfg, "ai_log.enabled", True))
     ai_model_name = str(cfg_get(cfg, "ai_log.model_name", "OmniQuantAI-v0.1"))
     ai_stage = str(cfg_get(cfg, "ai_log.stage", "Decision Making"))
+    # config is immutable after load — resolve once, not once per loop
+    upload_hold_logs = bool(cfg_get(cfg, "ai_log.upload_hold_logs", False))
 
     print("\n===============================")
     print("🚀 OmniQuantAI - WEEX LIVE START")
@@ -102,13 +177,24 @@ def main():
     # --- init clients ---
     client = WEEXClient(debug=True)
 
-    # set leverage once at startup
-    try:
-        print("⚙️ Setting WEEX leverage...")
-        lev_resp = client.set_leverage(symbol, leverage)
-        print("✅ Leverage response:", lev_resp)
-    except Exception as e:
-        print("⚠️ Failed to set leverage (continuing):", str(e))
+    # push ticker feed (falls back to REST polling when unavailable)
+    if client.start_ws_feed(symbol):
+        print("📶 WEEX websocket ticker feed started")
+    else:
+        print("📶 websocket-client not installed — using REST ticker polling")
+
+    # set leverage once at startup (skipped when a recent restart already
+    # set the same symbol/leverage pair)
+    if _leverage_cache_valid(symbol, leverage):
+        print("⚙️ Leverage already set recently — skipping.")
+    else:
+        try:
+            print("⚙️ Setting WEEX leverage...")
+            lev_resp = client.set_leverage(symbol, leverage)
+            print("✅ Leverage response:", lev_resp)
+            _write_leverage_cache(symbol, leverage)
+        except Exception as e:
+            print("⚠️ Failed to set leverage (continuing):", str(e))
 
     # state + execution engine
     pm = PositionManager(client=client, symbol=symbol)
@@ -122,50 +208,75 @@ def main():
         enabled=ai_log_enabled,
     )
 
+    # SIGINT sets the stop event so any in-progress safe_sleep ends at once
+    signal.signal(signal.SIGINT, lambda *_: _STOP.set())
+
+    # one pool for the per-iteration REST reads — ticker fetch and position
+    # sync are independent, so they overlap instead of serializing two RTTs
+    pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="weex-io")
+
+    # Router + decision are pure functions of the ticker fields — during
+    # quiet windows the same tick repeats, so reuse the last result instead
+    # of recomputing. TTL-bounded; risk/execution still runs every loop.
+    decision_cache: Dict[tuple, tuple] = {}
+    decision_ttl = loop_seconds * 2
+
     failures = 0
 
-    while True:
+    while not _STOP.is_set():
         try:
             # ------------------------------------------------
             # 1) Market fetch
             # ------------------------------------------------
-            ticker = client.get_ticker(symbol)
+            f_ticker = pool.submit(client.latest_ticker, symbol)
+            f_pos = pool.submit(pm.sync_from_exchange)
+            ticker = f_ticker.result()
+            f_pos.result()
             last = _safe_float(ticker.get("last"), 0.0)
 
-            print("\n📡 Market Snapshot")
-            print("Symbol:", symbol)
-            print("Last:", last)
-            print("24h Change:", ticker.get("priceChangePercent"))
-            print("Volume 24h:", ticker.get("volume_24h"))
-
             # ------------------------------------------------
-            # 2) Regime router
+            # 2+3) Regime router + decision engine (cached on tick)
             # ------------------------------------------------
-            router = route_regime(ticker=ticker)
-
-            print("\n🧭 Regime Router")
-            print("Regime:", router.get("regime"))
-            print("Confidence:", router.get("confidence"))
-            print("Trend score:", router.get("trend_score"))
-            print("Chop score:", router.get("chop_score"))
-            print("Vol score:", router.get("vol_score"))
-
-            # ------------------------------------------------
-            # 3) Decision engine
-            # ------------------------------------------------
-            decision = make_decision(
-                raw_signals=router.get("signals", {})
+            key = _ticker_key(ticker)
+            now = time.monotonic()
+            cached = decision_cache.get(key)
+
+            if cached is not None and (now - cached[0]) <= decision_ttl:
+                router, decision = cached[1], cached[2]
+            else:
+                router = route_regime(ticker=ticker)
+                decision = make_decision(
+                    raw_signals=router.get("signals", {})
+                )
+
+                # attach router regime into decision for full trace
+                decision["regime"] = router.get("regime")
+                decision["router_confidence"] = router.get("confidence")
+
+                if len(decision_cache) > 128:
+                    decision_cache.clear()
+                decision_cache[key] = (now, router, decision)
+
+            # One pre-formatted write per iteration instead of ~12 print
+            # calls — one stdout lock acquisition + syscall
+            print(
+                f"\n📡 Market Snapshot\n"
+                f"Symbol: {symbol}\n"
+                f"Last: {last}\n"
+                f"24h Change: {ticker.get('priceChangePercent')}\n"
+                f"Volume 24h: {ticker.get('volume_24h')}\n"
+                f"\n🧭 Regime Router\n"
+                f"Regime: {router.get('regime')}\n"
+                f"Confidence: {router.get('confidence')}\n"
+                f"Trend score: {router.get('trend_score')}\n"
+                f"Chop score: {router.get('chop_score')}\n"
+                f"Vol score: {router.get('vol_score')}\n"
+                f"\n🧠 Decision Engine\n"
+                f"Decision: {decision.get('decision')}\n"
+                f"Score: {decision.get('score')}\n"
+                f"Confidence: {decision.get('confidence')}"
             )
 
-            # attach router regime into decision for full trace
-            decision["regime"] = router.get("regime")
-            decision["router_confidence"] = router.get("confidence")
-
-            print("\n🧠 Decision Engine")
-            print("Decision:", decision.get("decision"))
-            print("Score:", decision.get("score"))
-            print("Confidence:", decision.get("confidence"))
-
             # ------------------------------------------------
             # 4) Manage lifecycle (open/close/hold)
             # ------------------------------------------------
@@ -182,11 +293,18 @@ def main():
             # execution_engine handles:
             # - if holding position -> exits (TP/SL/time/regime flip)
             # - if no position -> open if BUY/SELL
+            # reject-before-match: never send an order once the switch is set
+            if _KILL.is_set():
+                print("🧨 Kill-switch engaged — skipping order management.")
+                break
+
+            # position already synced concurrently with the ticker fetch
             action_result = engine.manage(
                 router=router,
                 decision=decision,
                 ticker=ticker,
                 model_name=ai_model_name,
+                sync=False,
             )
 
             print("\n⚙️ Engine Result:", action_result)
@@ -198,8 +316,6 @@ def main():
             if ai_log_enabled:
                 # only upload non-trade logs occasionally (avoid spam)
                 # upload when HOLD or NO_TRADE every N loops
-                upload_hold_logs = bool(cfg_get(cfg, "ai_log.upload_hold_logs", False))
-
                 if upload_hold_logs and action_result.get("action") in ("NO_TRADE", "HOLD_POSITION"):
                     payload = ai_logger.build_payload(
                         order_id=None,
@@ -211,24 +327,37 @@ def main():
                     ai_logger.upload(client=client, payload=payload)
 
             failures = 0
-            safe_sleep(loop_seconds)
+            # event-driven pacing: wake as soon as the ws feed pushes a new
+            # tick; fixed cadence remains the fallback when the feed is down
+            if not client.wait_for_tick(loop_seconds):
+                safe_sleep(loop_seconds)
 
         except KeyboardInterrupt:
-            print("\n🛑 Stopped by user.")
-            break
+            # fallback if the SIGINT handler was not installed (e.g. non-main
+            # thread) — shutdown is handled after the loop
+            _STOP.set()
 
         except Exception as e:
             failures += 1
-            print("\n❌ ERROR in run loop:", str(e))
-            print(traceback.format_exc())
+            print(f"\n❌ ERROR in run loop: {type(e).__name__}: {e}")
+            # full traceback only on the first failure and near the kill
+            # switch — formatting walks every frame + source line and is
+            # wasted on routine transient HTTP errors
+            if failures == 1 or failures >= max_failures - 1:
+                print(traceback.format_exc())
 
             if failures >= max_failures:
                 print(f"\n🧨 Kill-switch triggered after {failures} consecutive failures. Exiting.")
+                engage_kill_switch()
                 break
 
             print(f"⏳ Waiting {pause_seconds}s then retrying... (failures={failures}/{max_failures})")
             safe_sleep(pause_seconds)
 
+    if _STOP.is_set() or _KILL.is_set():
+        print("\n🛑 Loop stopped — draining AI logs.")
+        ai_logger.flush(timeout=10)
+
 
 if __name__ == "__main__":
     main()
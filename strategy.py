@@ -1,6 +1,28 @@
 import pandas as pd
 import numpy as np
 
+# numba compiles the per-bar signal loop to native code for backtests;
+# the numpy path below stays as fallback when numba is not installed.
+try:
+    from numba import njit as _njit
+except ImportError:
+    _njit = None
+
+
+def _signals_kernel(close):
+    """Per-bar direction signal (-1/0/1) as one native-code pass."""
+    out = np.empty(close.size, np.int8)
+    out[0] = 0
+    for i in range(1, close.size):
+        d = close[i] - close[i - 1]
+        out[i] = 1 if d > 0 else (-1 if d < 0 else 0)
+    return out
+
+
+if _njit is not None:
+    _signals_kernel = _njit(cache=True)(_signals_kernel)
+
+
 class OmniQuantAI:
     """
     Autonomous AI trading agent that detects market regimes
@@ -11,7 +33,14 @@ class OmniQuantAI:
 
     def detect_regime(self, data):
         """Detect market regime based on volatility"""
-        volatility = data['Close'].pct_change().rolling(window=3).std().iloc[-1]
+        # only the last rolling window matters — compute the std of the
+        # last 3 returns from the last 4 closes instead of materializing
+        # pct_change + rolling over the whole history
+        c = data['Close'].to_numpy(np.float64)[-4:]
+        if c.size < 4:
+            return "Stable"
+        r = np.diff(c) / c[:-1]
+        volatility = r.std(ddof=1)  # ddof=1 matches pandas rolling().std()
         if volatility > 0.02:
             return "High Volatility"
         else:
@@ -29,5 +58,11 @@ class OmniQuantAI:
         regime = self.detect_regime(data)
         strategy = self.select_strategy(regime)
         print(f"Detected Regime: {regime}, Selected Strategy: {strategy}")
-        signals = np.sign(data['Close'].diff().fillna(0))
+        close = np.ascontiguousarray(data['Close'].to_numpy(np.float64))
+        if _njit is not None:
+            # compiled loop: int8 out, no intermediate diff array
+            signals = _signals_kernel(close)
+        else:
+            # one numpy pass — no pandas diff/fillna Series allocations
+            signals = np.sign(np.diff(close, prepend=close[0]))
         return signals
@@ -1,12 +1,16 @@
 import matplotlib.pyplot as plt
+import numpy as np
 import seaborn as sns
 
 sns.set(style="whitegrid")
 
 def plot_signals(data, signals, title="Trading Signals"):
+    # materialize each column once — plot and scatter share the arrays
+    dates = data['Date'].to_numpy()
+    prices = data['Close'].to_numpy()
     plt.figure(figsize=(12,6))
-    plt.plot(data['Date'], data['Close'], label="Price", color='blue')
-    plt.scatter(data['Date'], data['Close'], c=signals, cmap='coolwarm', label="Signals", marker='o')
+    plt.plot(dates, prices, label="Price", color='blue')
+    plt.scatter(dates, prices, c=np.asarray(signals), cmap='coolwarm', label="Signals", marker='o')
     plt.title(title)
     plt.xlabel("Date")
     plt.ylabel("Price")
@@ -1,13 +1,15 @@
 # api_test.py
+import logging
 import time
-import hmac
-import hashlib
-import base64
 import requests
+from requests.adapters import HTTPAdapter, Retry
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
+from weex.client import sign
+
 # ------------------------
 # LOAD ENV
 # ------------------------
@@ -19,6 +21,15 @@ API_PASSPHRASE = os.getenv("WEEX_API_PASSPHRASE")
 
 assert API_KEY and API_SECRET and API_PASSPHRASE, "❌ Missing API credentials"
 
+# Full response bodies only when explicitly asked — decoding + printing
+# ~50KB of JSON per call dominates tight test loops
+DEBUG = os.getenv("WEEX_DEBUG") == "1"
+
+# Request trace via logging — silent (no stdout lock/syscall) unless a
+# handler is installed; __main__ installs one
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
 PUBLIC_BASE = "https://contract.weex.com"
 PRIVATE_BASE = "https://api-contract.weex.com"
 
@@ -27,66 +38,87 @@ LEVERAGE = 1
 QTY = "0.0002"  # ~10 USDT
 BASE_URL = "https://api-contract.weex.com"
 
+# one keep-alive session for the whole test flow — 7 sequential calls
+# against the same host would otherwise pay 7 TLS handshakes
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        # backoff handled by the adapter — GETs only, orders never retried
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=["GET"],
+        ),
+    ),
+)
+
 # ------------------------
 # SIGNATURES
 # ------------------------
-def sign_get(secret, timestamp, method, path, query):
-    msg = f"{timestamp}{method}{path}{query}"
-    digest = hmac.new(secret.encode(), msg.encode(), hashlib.sha256).digest()
-    return base64.b64encode(digest).decode()
-
-def sign_post(secret, timestamp, method, path, query, body):
-    msg = f"{timestamp}{method}{path}{query}{body}"
-    digest = hmac.new(secret.encode(), msg.encode(), hashlib.sha256).digest()
-    return base64.b64encode(digest).decode()
+# All signing goes through weex.client.sign — one optimized implementation
+# (prototype-copy HMAC, cached endpoint prefix) instead of local copies.
+
+# Static header fields built once — per request we copy and patch the two
+# variable fields instead of re-hashing six string keys into a new literal
+_HEADERS_TEMPLATE = {
+    "ACCESS-KEY": API_KEY,
+    "ACCESS-SIGN": "",
+    "ACCESS-TIMESTAMP": "",
+    "ACCESS-PASSPHRASE": API_PASSPHRASE,
+    "Content-Type": "application/json",
+    "locale": "en-US"
+}
 
 def auth_headers(signature, timestamp):
-    return {
-        "ACCESS-KEY": API_KEY,
-        "ACCESS-SIGN": signature,
-        "ACCESS-TIMESTAMP": timestamp,
-        "ACCESS-PASSPHRASE": API_PASSPHRASE,
-        "Content-Type": "application/json",
-        "locale": "en-US"
-    }
+    h = _HEADERS_TEMPLATE.copy()
+    h["ACCESS-SIGN"] = signature
+    h["ACCESS-TIMESTAMP"] = timestamp
+    return h
 
 # ------------------------
 # REQUEST HELPERS
 # ------------------------
 def private_get(path, query=""):
-    timestamp = str(int(time.time() * 1000))
-    sig = sign_get(API_SECRET, timestamp, "GET", path, query)
+    sig, timestamp = sign("GET", path, query)
     headers = auth_headers(sig, timestamp)
 
     url = BASE_URL + path + query
-    print("\n➡️ REQUEST URL:", url)
+    log.info("➡️ REQUEST URL: %s", url)
 
-    r = requests.get(url, headers=headers, timeout=10)
-    print("⬅️ STATUS:", r.status_code)
-    print("⬅️ RESPONSE:", r.text)
+    r = _SESSION.get(url, headers=headers, timeout=10)
+    log.info("⬅️ STATUS: %s", r.status_code)
+    if DEBUG:
+        log.info("⬅️ RESPONSE: %s", r.text)
     return r
 
 def private_post(path, body):
-    timestamp = str(int(time.time() * 1000))
-    body_json = json.dumps(body)
-    sig = sign_post(API_SECRET, timestamp, "POST", path, "", body_json)
+    # pre-serialized bytes bodies pass through untouched — the same bytes
+    # are signed and sent, no json.dumps on the hot path
+    body_json = body if isinstance(body, bytes) else json.dumps(body)
+    sig, timestamp = sign("POST", path, "", body_json)
     headers = auth_headers(sig, timestamp)
 
     url = BASE_URL + path
-    print("\n➡️ REQUEST URL:", url)
+    log.info("➡️ REQUEST URL: %s", url)
 
-    r = requests.post(url, headers=headers, data=body_json, timeout=10)
-    print("⬅️ STATUS:", r.status_code)
-    print("⬅️ RESPONSE:", r.text)
+    r = _SESSION.post(url, headers=headers, data=body_json, timeout=10)
+    log.info("⬅️ STATUS: %s", r.status_code)
+    if DEBUG:
+        log.info("⬅️ RESPONSE: %s", r.text)
     return r
 
 def public_get(path, params=""):
     url = BASE_URL + path + params
-    print("\n➡️ REQUEST URL:", url)
+    log.info("➡️ REQUEST URL: %s", url)
 
-    r = requests.get(url, timeout=10)
-    print("⬅️ STATUS:", r.status_code)
-    print("⬅️ RESPONSE:", r.text)
+    r = _SESSION.get(url, timeout=10)
+    log.info("⬅️ STATUS: %s", r.status_code)
+    if DEBUG:
+        log.info("⬅️ RESPONSE: %s", r.text)
     return r
 
 # ------------------------
@@ -122,29 +154,55 @@ def set_leverage(symbol, margin_mode=1, long_leverage="2", short_leverage=None):
     return private_post("/capi/v2/account/leverage", body)
 
 # Place Order
-def place_order(symbol, client_oid, size, type_, order_type="0", match_price="0", price="0",
-                presetTakeProfitPrice=None, presetStopLossPrice=None, margin_mode=1):
+
+# Fixed-shape order body pre-serialized once — per order we substitute the
+# variable fields instead of building a dict and json.dumps-ing it. The
+# resulting bytes are exactly what gets signed and sent.
+_ORDER_TEMPLATE = (
+    b'{"symbol": "%s", "client_oid": "%s", "size": "%s", "type": "%s", '
+    b'"order_type": "%s", "match_price": "%s", "price": "%s", "marginMode": %d}'
+)
+
+def place_order(symbol: str, client_oid: str, size: str, type_: str, order_type: str = "0",
+                match_price: str = "0", price: str = "0",
+                presetTakeProfitPrice=None, presetStopLossPrice=None, margin_mode: int = 1):
     """
-    type_: 1=open long, 2=open short, 3=close long, 4=close short
-    order_type: 0=Normal, 1=Post-Only, 2=FOK, 3=IOC
-    match_price: 0=Limit, 1=Market
+    type_: "1"=open long, "2"=open short, "3"=close long, "4"=close short
+    order_type: "0"=Normal, "1"=Post-Only, "2"=FOK, "3"=IOC
+    match_price: "0"=Limit, "1"=Market
+
+    All string fields must be passed as str — no per-call str() coercion.
     """
+    print(f"\n🔹 Place Order ({symbol}, {client_oid})")
+
+    if presetTakeProfitPrice is None and presetStopLossPrice is None:
+        # common case: 8 fixed keys — bytes-% substitution, no dict/dumps
+        body = _ORDER_TEMPLATE % (
+            symbol.encode(),
+            client_oid.encode(),
+            size.encode(),
+            type_.encode(),
+            order_type.encode(),
+            match_price.encode(),
+            price.encode(),
+            margin_mode,
+        )
+        return private_post("/capi/v2/order/placeOrder", body)
+
     body = {
         "symbol": symbol,
         "client_oid": client_oid,
         "size": size,
-        "type": str(type_),
+        "type": type_,
         "order_type": order_type,
         "match_price": match_price,
-        "price": str(price),
+        "price": price,
         "marginMode": margin_mode
     }
     if presetTakeProfitPrice:
         body["presetTakeProfitPrice"] = str(presetTakeProfitPrice)
     if presetStopLossPrice:
         body["presetStopLossPrice"] = str(presetStopLossPrice)
-
-    print(f"\n🔹 Place Order ({symbol}, {client_oid})")
     return private_post("/capi/v2/order/placeOrder", body)
 
 # Get Current Orders
@@ -194,34 +252,41 @@ def get_order_fills(symbol=None, order_id=None, start_time=None, end_time=None,
 # MAIN TEST FLOW
 # ------------------------
 if __name__ == "__main__":
+    # interactive run — make the request trace visible
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     print("\n=== WEEX API TEST START ===")
 
-    # 1. Check account balance
-    test_balance()
+    pool = ThreadPoolExecutor(max_workers=4)
 
-    # 2. Check BTC/USDT price
-    test_price("cmt_btcusdt")
+    # 1+2. Balance and price are independent reads — overlap their RTTs
+    f_balance = pool.submit(test_balance)
+    f_price = pool.submit(test_price, "cmt_btcusdt")
+    f_balance.result()
+    f_price.result()
 
-    # 3. Set leverage example
+    # 3. Set leverage example (must precede the order)
     set_leverage(symbol="cmt_btcusdt", margin_mode=1, long_leverage="5")
 
     # 4. Place a test order
     place_order(
         symbol="cmt_btcusdt",
-        client_oid=str(int(time.time()*1000)),
+        client_oid=str(time.time_ns() // 1_000_000),
         size="0.001",
-        type_=1,  # Open long
+        type_="1",  # Open long
         order_type="0",
         match_price="1",  # Market
     )
 
-    # 5. Get current open orders
+    # 5. Get current open orders (after the order, sequential)
     get_current_orders(symbol="cmt_btcusdt")
 
-    # 6. Get historical orders
-    get_order_history(symbol="cmt_btcusdt", page_size=10)
+    # 6+7. History and fills are independent reads — overlap them too
+    f_history = pool.submit(get_order_history, "cmt_btcusdt", 10)
+    f_fills = pool.submit(get_order_fills, "cmt_btcusdt", limit=10)
+    f_history.result()
+    f_fills.result()
 
-    # 7. Get fills (executed trades)
-    get_order_fills(symbol="cmt_btcusdt", limit=10)
+    pool.shutdown()
 
     print("\n=== WEEX API TEST END ===")
@@ -17,16 +17,39 @@ Used by:
 
 from __future__ import annotations
 
+import logging
 import os
+import threading
 import time
 import hmac
 import hashlib
-import base64
+import binascii
 import json
+from functools import lru_cache
 from typing import Dict, Any, Optional
 import requests
+from requests.adapters import HTTPAdapter, Retry
 from dotenv import load_dotenv
 
+# websocket-client powers the push ticker feed; REST polling still works
+# without it.
+try:
+    import websocket
+except ImportError:
+    websocket = None
+
+# Request tracing goes through logging, not print — a no-op (no stdout
+# lock, no syscall) unless the app installs a handler. run.py does.
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+# orjson parses/serializes the ticker, assets and order payloads handled
+# every loop ~2-5x faster than stdlib json.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # ============================================================
 # ENV + CONFIG
@@ -44,72 +67,285 @@ if not WEEX_API_KEY or not WEEX_API_SECRET or not WEEX_API_PASSPHRASE:
     )
 
 BASE_URL = os.getenv("WEEX_BASE_URL", "https://api-contract.weex.com").rstrip("/")
+WS_URL = os.getenv("WEEX_WS_URL", "wss://ws-contract.weex.com/ws")
 DEFAULT_LOCALE = os.getenv("WEEX_LOCALE", "en-US")
 
+# SIMD base64 (libbase64: SSE/AVX2/NEON kernels) when installed; fallback
+# is binascii.b2a_base64 — the C function base64.b64encode wraps, called
+# directly with the newline suppressed.
+try:
+    from pybase64 import b64encode as _b64encode
+except ImportError:
+    def _b64encode(data: bytes) -> bytes:
+        return binascii.b2a_base64(data, newline=False)
+
+# Secret encoded + HMAC key schedule derived once — per-signature copies
+# skip re-encoding the secret and re-deriving the ipad/opad blocks.
+_SECRET_BYTES = WEEX_API_SECRET.encode("utf-8")
+_HMAC_PROTO = hmac.new(_SECRET_BYTES, None, hashlib.sha256)
+
+# Header fields that never change — copied into each request's headers
+# instead of rebuilding the full literal. Pre-encoded to bytes: requests
+# accepts bytes header names/values, so urllib3's header writer skips the
+# per-header str->bytes encode (6 headers x every signed call).
+_STATIC_HEADERS = {
+    b"ACCESS-KEY": WEEX_API_KEY.encode("ascii"),
+    b"ACCESS-PASSPHRASE": WEEX_API_PASSPHRASE.encode("ascii"),
+    b"Content-Type": b"application/json",
+    b"locale": DEFAULT_LOCALE.encode("ascii"),
+}
+
 
 # ============================================================
 # SIGNING
 # ============================================================
 
-def _build_query_string(params: Optional[Dict[str, Any]]) -> str:
+# Pre-sorted parameter order per endpoint — skips the per-request
+# sorted() for the known key sets. Unknown paths/keys fall back to sorting.
+_QUERY_TEMPLATES: Dict[str, tuple] = {
+    "/capi/v2/market/ticker": ("symbol",),
+    "/capi/v2/account/position/singlePosition": ("symbol",),
+    "/capi/v2/order/current": ("endTime", "limit", "orderId", "page", "startTime", "symbol"),
+    "/capi/v2/order/history": ("createDate", "endCreateDate", "pageSize", "symbol"),
+    "/capi/v2/order/fills": ("endTime", "limit", "orderId", "startTime", "symbol"),
+}
+
+
+@lru_cache(maxsize=64)
+def _sorted_keys(keys: tuple) -> tuple:
+    """Sorted key order cached per key set — values change, keys don't."""
+    return tuple(sorted(keys))
+
+
+def _build_query_string(params: Optional[Dict[str, Any]], path: Optional[str] = None) -> str:
     """
     WEEX signing requires stable query formatting:
     ?a=1&b=2 (sorted by key)
     """
     if not params:
         return ""
-    pairs = []
-    for k in sorted(params.keys()):
-        pairs.append(f"{k}={params[k]}")
-    return "?" + "&".join(pairs)
+    keys = _QUERY_TEMPLATES.get(path)
+    if keys is not None and all(k in keys for k in params):
+        return "?" + "&".join(f"{k}={params[k]}" for k in keys if k in params)
+    keys = _sorted_keys(tuple(params))
+    return "?" + "&".join(f"{k}={params[k]}" for k in keys)
+
+
+@lru_cache(maxsize=128)
+def _prepared_query(path: str, items: tuple) -> str:
+    """
+    Fully-built query string memoized per (path, params) pair — polling
+    endpoints repeat the exact same params every cycle, so after the first
+    call only the timestamp/HMAC remain per-request work.
+    """
+    return _build_query_string(dict(items), path)
+
+
+@lru_cache(maxsize=128)
+def _endpoint_prefix(method: str, request_path: str, query_string: str) -> bytes:
+    """METHOD+path+query encoded once per endpoint — constant across calls."""
+    return (method.upper() + request_path + query_string).encode("utf-8")
 
 
 def _generate_signature(
-    secret_key: str,
     timestamp: str,
     method: str,
     request_path: str,
     query_string: str = "",
-    body: str = ""
+    body: "str | bytes" = ""
 ) -> str:
     """
     WEEX signature format (confirmed working):
     message = timestamp + METHOD + request_path + query_string + body
     signature = Base64(HMAC_SHA256(secret, message))
     """
-    message = f"{timestamp}{method.upper()}{request_path}{query_string}{body}"
-    digest = hmac.new(
-        secret_key.encode("utf-8"),
-        message.encode("utf-8"),
-        hashlib.sha256
-    ).digest()
-    return base64.b64encode(digest).decode("utf-8")
+    # incremental updates — no full message string built or re-encoded
+    h = _HMAC_PROTO.copy()
+    h.update(timestamp.encode("utf-8"))
+    h.update(_endpoint_prefix(method, request_path, query_string))
+    if body:
+        # POST bodies arrive as the exact bytes that go on the wire
+        h.update(body if isinstance(body, bytes) else body.encode("utf-8"))
+    # base64 output is pure ASCII — decode("ascii") avoids the UTF-8 scan
+    return _b64encode(h.digest()).decode("ascii")
+
+
+@lru_cache(maxsize=512)
+def _cached_get_signature(timestamp: str, method: str, request_path: str, query_string: str) -> str:
+    """Signature cache for idempotent GET polling (keyed on second buckets)."""
+    return _generate_signature(timestamp, method, request_path, query_string)
+
+
+def sign(
+    method: str,
+    path: str,
+    query: str = "",
+    body: "str | bytes" = "",
+    *,
+    ts: Optional[str] = None,
+) -> "tuple[str, str]":
+    """
+    Single signing entry point for scripts/tests — returns (signature, ts).
+
+    Keeps every caller on the one optimized signer (prototype-copy HMAC,
+    cached endpoint prefix) instead of re-implementing it per file.
+    """
+    if ts is None:
+        ts = str(time.time_ns() // 1_000_000)
+    return _generate_signature(ts, method, path, query, body), ts
 
 
 def _build_headers(
     method: str,
     request_path: str,
     query_string: str = "",
-    body: str = ""
-) -> Dict[str, str]:
-    ts = str(int(time.time() * 1000))
-    sign = _generate_signature(
-        WEEX_API_SECRET,
-        ts,
-        method,
-        request_path,
-        query_string,
-        body
-    )
+    body: "str | bytes" = ""
+) -> Dict[bytes, bytes]:
+    ts_ms = time.time_ns() // 1_000_000
+    if method == "GET" and not body:
+        # bucket GET timestamps to whole seconds so repeated polls of the
+        # same endpoint within a second reuse the cached signature
+        ts = str(ts_ms - ts_ms % 1000)
+        sign = _cached_get_signature(ts, method, request_path, query_string)
+    else:
+        ts = str(ts_ms)
+        sign = _generate_signature(
+            ts,
+            method,
+            request_path,
+            query_string,
+            body
+        )
+
+    headers = _STATIC_HEADERS.copy()
+    # two encodes here replace six in urllib3's header writer
+    headers[b"ACCESS-SIGN"] = sign.encode("ascii")
+    headers[b"ACCESS-TIMESTAMP"] = ts.encode("ascii")
+    return headers
+
+
+# ============================================================
+# ASSETS HELPERS
+# ============================================================
+
+def extract_usdt_equity(assets: Any) -> float:
+    """
+    USDT equity from a /capi/v2/account/assets response.
+
+    Builds a coin -> row index once per response so the lookup stays O(1)
+    regardless of how many coins the account holds.
+    """
+    rows = assets.get("data", assets) if isinstance(assets, dict) else assets
+    if not isinstance(rows, list):
+        rows = [rows] if rows else []
+
+    by_coin = {str(r.get("coinName", "")).upper(): r for r in rows if isinstance(r, dict)}
+    row = by_coin.get("USDT")
+    if row is None:
+        raise RuntimeError("❌ No USDT row in WEEX assets response")
+    try:
+        return float(row.get("equity", "0"))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# ============================================================
+# WEBSOCKET TICKER FEED
+# ============================================================
 
-    return {
-        "ACCESS-KEY": WEEX_API_KEY,
-        "ACCESS-SIGN": sign,
-        "ACCESS-TIMESTAMP": ts,
-        "ACCESS-PASSPHRASE": WEEX_API_PASSPHRASE,
-        "Content-Type": "application/json",
-        "locale": DEFAULT_LOCALE,
-    }
+class WeexWSFeed:
+    """
+    Push-based ticker cache.
+
+    A daemon thread keeps one WEEX websocket subscription open and writes
+    every ticker push into a lock-protected slot. Readers get the latest
+    tick in-memory instead of a REST round-trip per loop iteration; the
+    client falls back to REST when the feed is missing or stale.
+    """
+
+    def __init__(self, symbol: str, url: str = WS_URL, debug: bool = False):
+        self.symbol = symbol
+        self.url = url
+        self.debug = debug
+        self._lock = threading.Lock()
+        # notifies waiters on every push — lets the run loop block until a
+        # new tick instead of sleeping a fixed interval
+        self._cv = threading.Condition(self._lock)
+        self._tick_count = 0
+        self._latest: Optional[Dict[str, Any]] = None
+        self._latest_at: float = 0.0
+        self._thread: Optional[threading.Thread] = None
+
+    # ----------------------------
+    # lifecycle
+    # ----------------------------
+
+    def start(self) -> bool:
+        if websocket is None:
+            return False
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run_forever, name="weex-ws-feed", daemon=True
+            )
+            self._thread.start()
+        return True
+
+    def _run_forever(self) -> None:
+        # reconnect loop — network blips must not kill the feed thread
+        while True:
+            try:
+                app = websocket.WebSocketApp(
+                    self.url,
+                    on_open=self._on_open,
+                    on_message=self._on_message,
+                )
+                app.run_forever(ping_interval=20, ping_timeout=10)
+            except Exception as e:
+                if self.debug:
+                    print("⚠️ WS feed error (reconnecting):", e)
+            time.sleep(2.0)
+
+    def _on_open(self, ws) -> None:
+        sub = {"op": "subscribe", "args": [f"swap/ticker:{self.symbol}"]}
+        ws.send(json.dumps(sub, separators=(",", ":")))
+
+    def _on_message(self, ws, message: str) -> None:
+        # WEEX keepalive is a bare "ping" text frame
+        if message == "ping":
+            ws.send("pong")
+            return
+        try:
+            msg = json.loads(message)
+        except Exception:
+            return
+        data = msg.get("data")
+        if not data:
+            return
+        tick = data[0] if isinstance(data, list) else data
+        if isinstance(tick, dict):
+            with self._cv:
+                self._latest = tick
+                self._latest_at = time.monotonic()
+                self._tick_count += 1
+                self._cv.notify_all()
+
+    # ----------------------------
+    # reads
+    # ----------------------------
+
+    def latest(self, max_age_seconds: float = 10.0) -> Optional[Dict[str, Any]]:
+        """Latest tick, or None when nothing fresh arrived."""
+        with self._lock:
+            tick, at = self._latest, self._latest_at
+        if tick is None or (time.monotonic() - at) > max_age_seconds:
+            return None
+        return tick
+
+    def wait_for_tick(self, timeout: float) -> bool:
+        """Block until a tick newer than now arrives (or timeout)."""
+        with self._cv:
+            seen = self._tick_count
+            return self._cv.wait_for(lambda: self._tick_count != seen, timeout=timeout)
 
 
 # ============================================================
@@ -127,28 +363,108 @@ class WEEXClient:
 
     def __init__(self, base_url: str = BASE_URL, debug: bool = True):
         self.base_url = base_url.rstrip("/")
+        # keep-alive pool: successive calls reuse the HTTPS connection
+        # instead of paying DNS + TCP + TLS handshake per request. One host
+        # pool is enough (single API host); maxsize covers the I/O workers.
         self.session = requests.Session()
+        # adapter-level retries for idempotent GETs only: exponential
+        # backoff, immediate retry on fast-fail connects — no fixed sleeps.
+        # POSTs (orders) are never retried here; the execution engine owns
+        # that decision.
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=4,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=[502, 503, 504],
+                    allowed_methods=["GET"],
+                ),
+            ),
+        )
+        self.session.headers["Connection"] = "keep-alive"
         self.debug = debug
+        self._ws_feed: Optional[WeexWSFeed] = None
+        # base_url + path concatenations cached per path
+        self._url_cache: Dict[str, str] = {}
+
+        # pre-warm: resolve DNS + complete the TLS handshake now so the
+        # first signed call doesn't pay it. Best-effort only.
+        try:
+            self.session.head(self.base_url, timeout=5)
+        except Exception:
+            pass
+
+    # ============================================================
+    # WebSocket ticker feed (optional, REST fallback)
+    # ============================================================
+
+    def start_ws_feed(self, symbol: str) -> bool:
+        """
+        Start the push ticker feed for `symbol`. Returns False when the
+        websocket-client package is not installed (REST polling still works).
+        """
+        if self._ws_feed is None or self._ws_feed.symbol != symbol:
+            self._ws_feed = WeexWSFeed(symbol, debug=self.debug)
+        return self._ws_feed.start()
+
+    def latest_ticker(self, symbol: str) -> Dict[str, Any]:
+        """
+        Latest ticker for `symbol` — in-memory websocket tick when fresh,
+        REST round-trip otherwise.
+        """
+        if self._ws_feed is not None and self._ws_feed.symbol == symbol:
+            tick = self._ws_feed.latest()
+            # only trust ws ticks that carry the fields the pipeline reads
+            if tick is not None and tick.get("last") is not None:
+                return tick
+        return self.get_ticker(symbol)
+
+    def wait_for_tick(self, timeout: float) -> bool:
+        """
+        Block until the feed pushes a new tick, up to `timeout` seconds.
+        Returns False when no feed is running — callers should fall back
+        to their fixed-cadence sleep.
+        """
+        feed = self._ws_feed
+        if feed is None or websocket is None:
+            return False
+        feed.wait_for_tick(timeout)
+        return True
 
     def _request(
         self,
         method: str,
         path: str,
         params: Optional[Dict[str, Any]] = None,
-        body: Optional[Dict[str, Any]] = None,
+        body: "Optional[Dict[str, Any] | bytes]" = None,
         private: bool = False,
         timeout: int = 15
     ) -> Dict[str, Any]:
-        method = method.upper()
-        path = path if path.startswith("/") else f"/{path}"
-
-        query_string = _build_query_string(params)
-        url = f"{self.base_url}{path}{query_string}"
-
-        # Body must be compact JSON when signed
-        json_body = ""
+        # internal wrappers always pass "GET"/"POST" and /-prefixed literal
+        # paths — external callers go through request(), which normalizes
+        assert method in ("GET", "POST") and path.startswith("/")
+
+        query_string = _prepared_query(path, tuple(params.items())) if params else ""
+        url_key = path + query_string
+        url = self._url_cache.get(url_key)
+        if url is None:
+            url = self._url_cache.setdefault(url_key, self.base_url + url_key)
+
+        # Body must be compact JSON when signed — the same bytes are signed
+        # and sent, with no str->bytes round-trip in between
+        json_body = b""
         if body is not None:
-            json_body = json.dumps(body, separators=(",", ":"))
+            if isinstance(body, (bytes, bytearray)):
+                # caller pre-serialized the body (e.g. order templates) —
+                # sign and send those exact bytes, nothing to re-serialize
+                json_body = bytes(body)
+            elif orjson is not None:
+                json_body = orjson.dumps(body)
+            else:
+                json_body = json.dumps(body, separators=(",", ":")).encode("utf-8")
 
         headers = None
         if private:
@@ -159,14 +475,12 @@ class WEEXClient:
                 body=json_body if method == "POST" else ""
             )
 
-        # Debug prints for WEEX support
+        # Debug trace for WEEX support — lazy %s formatting, only rendered
+        # when a handler is active
         if self.debug:
-            print("\n➡️ REQUEST")
-            print("URL:", url)
-            print("METHOD:", method)
-            print("PRIVATE:", private)
+            log.info("➡️ REQUEST %s %s private=%s", method, url, private)
             if body is not None:
-                print("BODY:", json_body)
+                log.info("➡️ BODY: %s", json_body)
 
         if method == "GET":
             r = self.session.get(url, headers=headers, timeout=timeout)
@@ -176,17 +490,19 @@ class WEEXClient:
             raise ValueError("Unsupported HTTP method. Use GET or POST.")
 
         if self.debug:
-            print("⬅️ STATUS:", r.status_code)
-            print("⬅️ RESPONSE:", r.text)
+            log.info("⬅️ STATUS: %s", r.status_code)
+            # truncated slice — r.text would charset-guess and decode the
+            # whole body just for the trace line
+            log.info("⬅️ RESPONSE: %s", r.content[:512].decode("utf-8", "replace"))
 
         # WEEX sometimes returns "" on errors
-        if not r.text:
+        if not r.content:
             r.raise_for_status()
             return {}
 
         # Parse JSON safely
         try:
-            data = r.json()
+            data = orjson.loads(r.content) if orjson is not None else r.json()
         except Exception:
             r.raise_for_status()
             return {"raw": r.text}
@@ -202,6 +518,24 @@ class WEEXClient:
     # Public / Private wrappers
     # ============================================================
 
+    def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: "Optional[Dict[str, Any] | bytes]" = None,
+        private: bool = False,
+        timeout: int = 15,
+    ) -> Dict[str, Any]:
+        """
+        Normalizing entry point for external callers — the internal
+        wrappers skip this and call _request with pre-normalized args.
+        """
+        method = method.upper()
+        path = path if path.startswith("/") else f"/{path}"
+        return self._request(method, path, params=params, body=body,
+                             private=private, timeout=timeout)
+
     def public_get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         return self._request("GET", path, params=params, private=False)
 
@@ -235,9 +569,10 @@ class WEEXClient:
         payload = {"symbol": symbol, "leverage": leverage}
         return self.private_post("/capi/v2/account/leverage", payload)
 
-    def place_order(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    def place_order(self, payload: "Dict[str, Any] | bytes") -> Dict[str, Any]:
         """
         POST /capi/v2/order/placeOrder
+        Accepts a dict or pre-serialized JSON bytes (signed/sent as-is).
         Returns:
         {"client_oid": "...", "order_id": "..."}
         """
@@ -22,14 +22,31 @@ Endpoints used:
 
 from __future__ import annotations
 
+import atexit
+import json
+import logging
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Optional, Dict, Any, Tuple
 
+import numpy as np
+
 from weex.client import WEEXClient
 from weex.position_manager import PositionManager
 from weex.ai_logger import AILogger
 
+# Execution trace via logging — lazy %s formatting keeps the retry loops
+# free of stdout locking/flushes when no handler is installed
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+# AI-log uploads leave the trade path immediately — a bounded pool absorbs
+# the POST round-trip; shutdown waits for in-flight uploads to land.
+_LOG_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ai-log")
+atexit.register(_LOG_POOL.shutdown)
+
 
 # ============================================================
 # Config
@@ -50,23 +67,43 @@ class ExecutionConfig:
     # retries
     max_open_retries: int = 2
     max_close_retries: int = 2
+    max_retry_backoff: float = 8.0   # seconds, backoff cap
+
+
+# bound once — skips the time-module attribute lookup in the order loops
+_time_ns = time.time_ns
 
 
 def _now_ms() -> int:
-    return int(time.time() * 1000)
+    # time_ns + integer divide — no float multiply/cast round-trip
+    return _time_ns() // 1_000_000
+
+
+def _retry_sleep(attempt: int, cap: float) -> None:
+    # exponential backoff with jitter — quick first retry for transient
+    # blips, progressively gentler on the exchange rate limiter
+    time.sleep(min(cap, (2 ** (attempt - 1)) * 0.25) + random.random() * 0.1)
 
 
 def _safe_float(x, default=0.0) -> float:
+    # type-check fast path — no exception machinery when x is already numeric
+    t = type(x)
+    if t is float:
+        return x
+    if t is int:
+        return float(x)
+    if x is None:
+        return float(default)
     try:
         return float(x)
-    except Exception:
+    except (TypeError, ValueError):
         return float(default)
 
 
-def _pct_change(current: float, entry: float) -> float:
-    if entry == 0:
-        return 0.0
-    return (current - entry) / entry
+# WEEX placeOrder type mapping — dict lookup instead of a branch chain
+# per trade decision. Bad inputs raise KeyError at the lookup site.
+_OPEN_TYPE = {"BUY": "1", "SELL": "2"}       # open long / open short
+_CLOSE_TYPE = {"LONG": "3", "SHORT": "4"}    # close long / close short
 
 
 # ============================================================
@@ -92,35 +129,54 @@ class ExecutionEngine:
         # ✅ New logger includes router + decision explanation + execution details
         self.ai_logger = AILogger(client=self.client, model_name="OmniQuantAI-v0.1")
 
+        # Order-body template per WEEX type code ("1"/"2" open long/short,
+        # "3"/"4" close long/short) — per order we copy and stamp a fresh
+        # client_oid instead of rebuilding the literal.
+        self._order_templates = {
+            t: {
+                "symbol": cfg.symbol,
+                "size": cfg.size,
+                "type": t,
+                "order_type": "0",
+                "match_price": "1",   # market (IOC-like behavior)
+                "price": "0",
+            }
+            for t in ("1", "2", "3", "4")
+        }
+
+        # The same four bodies pre-serialized to JSON bytes with a client_oid
+        # placeholder — per order only the oid is %-substituted and the client
+        # signs/sends the bytes without a per-order json dump.
+        self._order_body_templates = {
+            t: json.dumps({**tmpl, "client_oid": "%s"}, separators=(",", ":")).encode("utf-8")
+            for t, tmpl in self._order_templates.items()
+        }
+
+        # Exit thresholds as price multipliers — should_exit compares
+        # last against entry * mult and only pays the pnl division when
+        # an exit actually fires (for the reason string).
+        tp, sl = cfg.take_profit_pct, cfg.stop_loss_pct
+        self._tp_mult_long = 1.0 + tp
+        self._sl_mult_long = 1.0 - sl
+        self._tp_mult_short = 1.0 - tp
+        self._sl_mult_short = 1.0 + sl
+
+        # regimes that flip-exit a given side
+        self._flip_regimes = {
+            "LONG": ("DOWNTREND", "CHOP"),
+            "SHORT": ("UPTREND", "CHOP"),
+        }
+
     # ----------------------------
-    # WEEX type mapping
+    # AI log (background)
     # ----------------------------
 
-    @staticmethod
-    def _open_type(direction: str) -> str:
-        """
-        WEEX placeOrder type mapping:
-        "1" = Open long
-        "2" = Open short
-        """
-        if direction == "BUY":
-            return "1"
-        if direction == "SELL":
-            return "2"
-        raise ValueError("direction must be BUY or SELL")
-
-    @staticmethod
-    def _close_type(position_side: str) -> str:
-        """
-        WEEX placeOrder type mapping:
-        "3" = Close long
-        "4" = Close short
-        """
-        if position_side == "LONG":
-            return "3"
-        if position_side == "SHORT":
-            return "4"
-        raise ValueError("position_side must be LONG or SHORT")
+    def _upload_log(self, **kwargs) -> None:
+        """Runs on the ai-log pool — failures are logged, never raised."""
+        try:
+            self.ai_logger.upload(**kwargs)
+        except Exception as log_err:
+            log.warning("⚠️ AI log upload failed (async): %s", log_err)
 
     # ----------------------------
     # OPEN
@@ -134,11 +190,14 @@ class ExecutionEngine:
         decision: Dict[str, Any],
         ticker: Dict[str, Any],
         model_name: str,
+        now_ms: Optional[int] = None,
     ) -> Tuple[bool, Optional[int]]:
         """
         Open new position ONLY if none exists.
         """
-        self.pm.sync_from_exchange()
+        if now_ms is None:
+            now_ms = _now_ms()
+        self.pm.sync_from_exchange(now_ms=now_ms)
         if self.pm.has_position():
             return False, None
 
@@ -146,24 +205,42 @@ class ExecutionEngine:
 
         for attempt in range(1, self.cfg.max_open_retries + 1):
             try:
-                payload = {
-                    "symbol": self.cfg.symbol,
-                    "client_oid": str(_now_ms()),
-                    "size": self.cfg.size,
-                    "type": self._open_type(direction),
-                    "order_type": "0",
-                    "match_price": "1",   # market (IOC-like behavior)
-                    "price": "0",
-                }
-
-                resp = self.client.place_order(payload)
+                order_type = _OPEN_TYPE[direction]
+                # first attempt reuses the cycle clock read; retries (after a
+                # backoff sleep) re-read it so the oid stays unique
+                client_oid = str(now_ms if attempt == 1 else _now_ms())
+                # dict copy kept for the AI-log trail; the wire body is the
+                # pre-serialized template with just the oid substituted
+                payload = self._order_templates[order_type].copy()
+                payload["client_oid"] = client_oid
+
+                resp = self.client.place_order(
+                    self._order_body_templates[order_type] % client_oid.encode()
+                )
                 order_id = int(resp.get("order_id")) if resp and resp.get("order_id") else None
 
-                # sync again to capture entry price & size
-                pos = self.pm.sync_from_exchange()
-
                 opened_side = "LONG" if direction == "BUY" else "SHORT"
 
+                # ✅ Upload AI Log (router + decision transparency) — queued
+                # to the log pool *before* the confirmation sync so the POST
+                # is in flight while we wait on the position GET
+                self.ai_logger.model_name = model_name  # keep model name consistent
+                _LOG_POOL.submit(
+                    self._upload_log,
+                    stage="Decision Making",
+                    symbol=self.cfg.symbol,
+                    router=router,
+                    decision=decision,
+                    ticker=ticker,
+                    order_id=str(order_id) if order_id else None,
+                    order_payload=payload,
+                    extra_notes=f"OPEN {opened_side} executed. attempt={attempt}",
+                )
+
+                # sync again to capture entry price & size — force past the
+                # TTL gate, the order just changed exchange state
+                pos = self.pm.sync_from_exchange(force=True)
+
                 # If WEEX didn't return entry price, fallback to ticker last
                 entry_price = self.pm.get_entry_price()
                 if entry_price <= 0:
@@ -178,28 +255,12 @@ class ExecutionEngine:
                         order_id=order_id,
                     )
 
-                # ✅ Upload AI Log immediately (router + decision transparency)
-                try:
-                    self.ai_logger.model_name = model_name  # keep model name consistent
-                    self.ai_logger.upload(
-                        stage="Decision Making",
-                        symbol=self.cfg.symbol,
-                        router=router,
-                        decision=decision,
-                        ticker=ticker,
-                        order_id=str(order_id) if order_id else None,
-                        order_payload=payload,
-                        extra_notes=f"OPEN {opened_side} executed. attempt={attempt}",
-                    )
-                except Exception as log_err:
-                    print("⚠️ AI log upload failed (open):", log_err)
-
-                print(f"✅ OPEN {opened_side} executed order_id={order_id}")
+                log.info("✅ OPEN %s executed order_id=%s", opened_side, order_id)
                 return True, order_id
 
             except Exception as e:
-                print(f"❌ OPEN attempt {attempt} failed: {e}")
-                time.sleep(1.0)
+                log.error("❌ OPEN attempt %s failed: %s", attempt, e)
+                _retry_sleep(attempt, self.cfg.max_retry_backoff)
 
         return False, order_id
 
@@ -215,11 +276,14 @@ class ExecutionEngine:
         decision: Dict[str, Any],
         ticker: Dict[str, Any],
         model_name: str,
+        now_ms: Optional[int] = None,
     ) -> Tuple[bool, Optional[int]]:
         """
         Close existing position ONLY if one exists.
         """
-        self.pm.sync_from_exchange()
+        if now_ms is None:
+            now_ms = _now_ms()
+        self.pm.sync_from_exchange(now_ms=now_ms)
         if not self.pm.has_position():
             return False, None
 
@@ -228,50 +292,46 @@ class ExecutionEngine:
 
         for attempt in range(1, self.cfg.max_close_retries + 1):
             try:
-                payload = {
-                    "symbol": self.cfg.symbol,
-                    "client_oid": str(_now_ms()),
-                    "size": self.cfg.size,
-                    "type": self._close_type(pos_side),
-                    "order_type": "0",
-                    "match_price": "1",
-                    "price": "0",
-                }
-
-                resp = self.client.place_order(payload)
+                order_type = _CLOSE_TYPE[pos_side]
+                client_oid = str(now_ms if attempt == 1 else _now_ms())
+                payload = self._order_templates[order_type].copy()
+                payload["client_oid"] = client_oid
+
+                resp = self.client.place_order(
+                    self._order_body_templates[order_type] % client_oid.encode()
+                )
                 close_order_id = int(resp.get("order_id")) if resp and resp.get("order_id") else None
 
-                # ✅ Upload AI Log immediately (router + decision transparency)
-                try:
-                    self.ai_logger.model_name = model_name
-                    self.ai_logger.upload(
-                        stage="Risk / Exit",
-                        symbol=self.cfg.symbol,
-                        router=router,
-                        decision=decision,
-                        ticker=ticker,
-                        order_id=str(close_order_id) if close_order_id else None,
-                        order_payload=payload,
-                        extra_notes=f"CLOSE {pos_side} reason={reason} attempt={attempt}",
-                    )
-                except Exception as log_err:
-                    print("⚠️ AI log upload failed (close):", log_err)
+                # ✅ Upload AI Log (router + decision transparency) — queued
+                # to the log pool so the close path never waits on the POST
+                self.ai_logger.model_name = model_name
+                _LOG_POOL.submit(
+                    self._upload_log,
+                    stage="Risk / Exit",
+                    symbol=self.cfg.symbol,
+                    router=router,
+                    decision=decision,
+                    ticker=ticker,
+                    order_id=str(close_order_id) if close_order_id else None,
+                    order_payload=payload,
+                    extra_notes=f"CLOSE {pos_side} reason={reason} attempt={attempt}",
+                )
 
-                # Sync to confirm close
-                self.pm.sync_from_exchange()
+                # Sync to confirm close — force past the TTL gate
+                self.pm.sync_from_exchange(force=True)
                 if self.pm.has_position():
-                    print("⚠️ Close sent but position still exists. Retrying...")
-                    time.sleep(1.0)
+                    log.warning("⚠️ Close sent but position still exists. Retrying...")
+                    _retry_sleep(attempt, self.cfg.max_retry_backoff)
                     continue
 
                 self.pm.set_closed(close_order_id=close_order_id)
 
-                print(f"✅ CLOSE executed order_id={close_order_id} reason={reason}")
+                log.info("✅ CLOSE executed order_id=%s reason=%s", close_order_id, reason)
                 return True, close_order_id
 
             except Exception as e:
-                print(f"❌ CLOSE attempt {attempt} failed: {e}")
-                time.sleep(1.0)
+                log.error("❌ CLOSE attempt %s failed: %s", attempt, e)
+                _retry_sleep(attempt, self.cfg.max_retry_backoff)
 
         return False, close_order_id
 
@@ -279,7 +339,12 @@ class ExecutionEngine:
     # Exit Logic
     # ----------------------------
 
-    def should_exit(self, router: Dict[str, Any], ticker: Dict[str, Any]) -> Tuple[bool, str]:
+    def should_exit(
+        self,
+        router: Dict[str, Any],
+        ticker: Dict[str, Any],
+        now_ms: Optional[int] = None,
+    ) -> Tuple[bool, str]:
         """
         Decide if we should exit current position.
         Returns (exit_now?, reason)
@@ -292,34 +357,65 @@ class ExecutionEngine:
         if entry <= 0 or last <= 0:
             return False, "unknown_prices"
 
-        pnl_pct = _pct_change(last, entry)
         side = self.pm.get_side()
 
-        # short pnl is inverted
+        # TP / SL as direct price-threshold comparisons against the
+        # precomputed multipliers; the pnl division runs only to format
+        # the reason string once an exit fires
         if side == "SHORT":
-            pnl_pct = -pnl_pct
-
-        # TP / SL
-        if pnl_pct >= self.cfg.take_profit_pct:
-            return True, f"take_profit_hit ({pnl_pct*100:.3f}%)"
-
-        if pnl_pct <= -self.cfg.stop_loss_pct:
-            return True, f"stop_loss_hit ({pnl_pct*100:.3f}%)"
+            if last <= entry * self._tp_mult_short:
+                return True, f"take_profit_hit ({(entry - last) / entry * 100:.3f}%)"
+            if last >= entry * self._sl_mult_short:
+                return True, f"stop_loss_hit ({(entry - last) / entry * 100:.3f}%)"
+        else:
+            if last >= entry * self._tp_mult_long:
+                return True, f"take_profit_hit ({(last - entry) / entry * 100:.3f}%)"
+            if last <= entry * self._sl_mult_long:
+                return True, f"stop_loss_hit ({(last - entry) / entry * 100:.3f}%)"
 
         # Time stop
-        if self.pm.get_age_seconds() >= self.cfg.max_hold_minutes * 60:
+        if self.pm.get_age_seconds(now_ms) >= self.cfg.max_hold_minutes * 60:
             return True, "time_stop"
 
         # Regime flip exit
         if self.cfg.regime_flip_exit:
             regime = str(router.get("regime") or "")
-            if side == "LONG" and regime in ("DOWNTREND", "CHOP"):
-                return True, f"regime_flip_exit ({regime})"
-            if side == "SHORT" and regime in ("UPTREND", "CHOP"):
+            if regime in self._flip_regimes.get(side, ()):
                 return True, f"regime_flip_exit ({regime})"
 
         return False, "hold"
 
+    def should_exit_batch(
+        self,
+        entries: np.ndarray,
+        last_prices: np.ndarray,
+        side_is_short: np.ndarray,
+        age_seconds: np.ndarray,
+        regime_flip: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Vectorized should_exit over N open positions (multi-symbol path).
+
+        Takes parallel arrays — entry prices, last prices, bool short-side
+        flags, position ages in seconds, and a bool regime-flip mask the
+        caller derives from the router. One NumPy pass replaces N Python
+        branch chains; the scalar should_exit stays the single-position
+        fast path.
+        """
+        pnl = (last_prices - entries) / np.where(entries != 0, entries, 1.0)
+        pnl = np.where(side_is_short, -pnl, pnl)
+
+        exits = (
+            (pnl >= self.cfg.take_profit_pct)
+            | (pnl <= -self.cfg.stop_loss_pct)
+            | (age_seconds >= self.cfg.max_hold_minutes * 60)
+        )
+        if self.cfg.regime_flip_exit:
+            exits = exits | regime_flip
+
+        # unknown prices never trigger an exit (mirrors the scalar guard)
+        return exits & (entries > 0) & (last_prices > 0)
+
     # ----------------------------
     # Main Manage Hook
     # ----------------------------
@@ -331,17 +427,27 @@ class ExecutionEngine:
         decision: Dict[str, Any],
         ticker: Dict[str, Any],
         model_name: str,
+        sync: bool = True,
     ) -> Dict[str, Any]:
         """
         Lifecycle:
         - If position open: exit management
         - Else: open if decision says BUY/SELL
+
+        Pass sync=False when the caller already synced the position this
+        iteration (avoids a duplicate REST round-trip).
+
+        One clock read per cycle: now_ms is captured here and threaded
+        through sync/exit/order calls, so every decision in the cycle
+        sees the same timestamp.
         """
-        self.pm.sync_from_exchange()
+        now_ms = _now_ms()
+        if sync:
+            self.pm.sync_from_exchange(now_ms=now_ms)
 
         # 1) If holding position -> manage exits
         if self.pm.has_position():
-            exit_now, reason = self.should_exit(router=router, ticker=ticker)
+            exit_now, reason = self.should_exit(router=router, ticker=ticker, now_ms=now_ms)
             if exit_now:
                 ok, close_id = self.close_position(
                     reason=reason,
@@ -349,6 +455,7 @@ class ExecutionEngine:
                     decision=decision,
                     ticker=ticker,
                     model_name=model_name,
+                    now_ms=now_ms,
                 )
                 return {"action": "CLOSE", "ok": ok, "order_id": close_id, "reason": reason}
 
@@ -370,5 +477,6 @@ class ExecutionEngine:
             decision=decision,
             ticker=ticker,
             model_name=model_name,
+            now_ms=now_ms,
         )
         return {"action": "OPEN", "ok": ok, "order_id": open_id, "reason": "entry_signal"}
@@ -13,27 +13,60 @@ Used by:
 
 from __future__ import annotations
 
+import atexit
 import json
 import os
+import threading
 import time
 from dataclasses import dataclass, asdict
 from typing import Optional, Dict, Any
 
 from weex.client import WEEXClient
 
+# orjson serializes the tiny state payload ~5-10x faster than stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # ============================================================
 # Helpers
 # ============================================================
 
 def _now_ms() -> int:
-    return int(time.time() * 1000)
+    # time_ns + integer divide — no float multiply/cast round-trip
+    return time.time_ns() // 1_000_000
+
+
+# WEEX position payloads vary by account type — canonical key fallbacks
+# resolved through one helper instead of per-field .get() or-chains
+_SIZE_KEYS = ("positionAmt", "size")
+_SIDE_KEYS = ("positionSide", "side")
+_PRICE_KEYS = ("avgPrice", "entryPrice")
+
+
+def _first(d: Dict[str, Any], keys: tuple, default=None):
+    """First truthy value among `keys` — mirrors the old or-chains."""
+    for k in keys:
+        v = d.get(k)
+        if v:
+            return v
+    return default
 
 
 def _safe_float(x, default=0.0) -> float:
+    # type-check fast path — no exception machinery when x is already numeric
+    t = type(x)
+    if t is float:
+        return x
+    if t is int:
+        return float(x)
+    if x is None:
+        return float(default)
     try:
         return float(x)
-    except Exception:
+    except (TypeError, ValueError):
         return float(default)
 
 
@@ -41,7 +74,7 @@ def _safe_float(x, default=0.0) -> float:
 # Canonical Position Schema
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class PositionState:
     symbol: str
     side: str                  # "LONG" or "SHORT"
@@ -52,8 +85,12 @@ class PositionState:
     last_order_id: Optional[int] = None
     last_close_order_id: Optional[int] = None
 
-    def age_seconds(self) -> float:
-        return (_now_ms() - self.opened_at_ms) / 1000.0
+    def age_seconds(self, now_ms: Optional[int] = None) -> float:
+        # callers that already read the clock this cycle pass it in —
+        # keeps every age check in one tick on the same timestamp
+        if now_ms is None:
+            now_ms = _now_ms()
+        return (now_ms - self.opened_at_ms) / 1000.0
 
 
 # ============================================================
@@ -81,32 +118,87 @@ class PositionManager:
         self.state_file = state_file
         self.position: Optional[PositionState] = None
 
+        # TTL gate: repeated syncs within the window reuse the last result
+        # instead of re-issuing the identical signed GET — manage() hops
+        # can hit this endpoint 2-3 times per tick otherwise
+        self._last_sync_ms: int = 0
+        self._sync_ttl_ms: int = int(os.getenv("PM_SYNC_TTL_MS", "500"))
+        self._sync_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+
+        # state dir exists for the lifetime of the instance — create once,
+        # not per save
+        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+
         # load from disk on boot (restart-safe)
         self.load()
 
+        # Debounced persistence for high-frequency updates: touch() and
+        # no-change syncs mark the state dirty and a background flusher
+        # writes at most every 250 ms. Position transitions (open/close)
+        # still save inline — they are rare and restart-critical.
+        self._dirty = False
+        self._stop_flusher = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="pm-flush", daemon=True
+        )
+        self._flusher.start()
+        atexit.register(self._final_flush)
+
     # ----------------------------
     # Persistence
     # ----------------------------
 
     def save(self) -> None:
-        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
-
         payload = {
             "saved_at_ms": _now_ms(),
             "symbol": self.symbol,
             "position": asdict(self.position) if self.position else None,
         }
 
-        with open(self.state_file, "w") as f:
-            json.dump(payload, f, indent=2)
+        if orjson is not None:
+            data = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(payload, indent=2).encode("utf-8")
+
+        # write-then-rename: a crash mid-write can never leave a torn
+        # state file for the next restart to trip over
+        tmp = self.state_file + ".tmp"
+        with self._save_lock:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self.state_file)
+
+    def _mark_dirty(self) -> None:
+        self._dirty = True
+
+    def _flush_loop(self) -> None:
+        while not self._stop_flusher.wait(0.25):
+            if self._dirty:
+                self._dirty = False
+                try:
+                    self.save()
+                except Exception:
+                    self._dirty = True  # retry next pass
+
+    def _final_flush(self) -> None:
+        self._stop_flusher.set()
+        if self._dirty:
+            self._dirty = False
+            try:
+                self.save()
+            except Exception:
+                pass  # shutting down — nothing left to retry into
 
     def load(self) -> None:
         if not os.path.exists(self.state_file):
             return
 
         try:
-            with open(self.state_file, "r") as f:
-                raw = json.load(f)
+            # single bytes read + orjson parse — no text-mode decode pass
+            with open(self.state_file, "rb") as f:
+                data = f.read()
+            raw = orjson.loads(data) if orjson is not None else json.loads(data)
 
             p = raw.get("position")
             if not p:
@@ -144,8 +236,8 @@ class PositionManager:
     def get_entry_price(self) -> float:
         return float(self.position.entry_price) if self.position else 0.0
 
-    def get_age_seconds(self) -> float:
-        return self.position.age_seconds() if self.position else 0.0
+    def get_age_seconds(self, now_ms: Optional[int] = None) -> float:
+        return self.position.age_seconds(now_ms) if self.position else 0.0
 
     # ----------------------------
     # State Updates (Local)
@@ -181,13 +273,15 @@ class PositionManager:
         """Update timestamp only."""
         if self.position:
             self.position.last_update_ms = _now_ms()
-            self.save()
+            self._mark_dirty()
 
     # ----------------------------
     # Sync from WEEX (Source of Truth)
     # ----------------------------
 
-    def sync_from_exchange(self) -> Optional[PositionState]:
+    def sync_from_exchange(
+        self, force: bool = False, now_ms: Optional[int] = None
+    ) -> Optional[PositionState]:
         """
         Sync local position with what WEEX reports.
         This prevents:
@@ -195,10 +289,26 @@ class PositionManager:
         - phantom positions
         - wrong exit sizing
 
+        Repeated calls within the TTL window return the cached state
+        without a network round-trip. Pass force=True when freshness
+        matters (e.g. right after an order went out).
+
         WEEX endpoint:
         GET /capi/v2/account/position/singlePosition?symbol=...
         """
+        if now_ms is None:
+            now_ms = _now_ms()
+        if not force and (now_ms - self._last_sync_ms) < self._sync_ttl_ms:
+            return self.position
+        with self._sync_lock:
+            # re-check under the lock — a concurrent caller may have synced
+            if not force and (now_ms - self._last_sync_ms) < self._sync_ttl_ms:
+                return self.position
+            return self._sync_now()
+
+    def _sync_now(self) -> Optional[PositionState]:
         data = self.client.get_single_position(self.symbol)
+        self._last_sync_ms = _now_ms()
 
         # If WEEX says "no position"
         if not data:
@@ -216,7 +326,7 @@ class PositionManager:
             return self.position
 
         # Try to parse size
-        size = _safe_float(pos.get("positionAmt") or pos.get("size") or 0.0)
+        size = _safe_float(_first(pos, _SIZE_KEYS, 0.0))
         if size == 0.0:
             # no open position
             if self.position is not None:
@@ -224,7 +334,7 @@ class PositionManager:
                 self.save()
             return None
 
-        side = str(pos.get("positionSide") or pos.get("side") or "").upper()
+        side = str(_first(pos, _SIDE_KEYS, "")).upper()
         if side not in ("LONG", "SHORT"):
             if side == "BUY":
                 side = "LONG"
@@ -233,24 +343,33 @@ class PositionManager:
             else:
                 side = "LONG"
 
-        entry_price = _safe_float(pos.get("avgPrice") or pos.get("entryPrice") or 0.0)
+        entry_price = _safe_float(_first(pos, _PRICE_KEYS, 0.0))
 
         now = _now_ms()
 
         # If local position exists, keep its opened_at_ms (more accurate for time-stop)
-        opened_at = self.position.opened_at_ms if self.position else now
+        prev = self.position
+
+        # Common case on polling ticks: nothing material changed. Bump the
+        # timestamp in place and let the debounced flusher persist it — no
+        # new dataclass, no inline serialize+write.
+        if prev is not None and (prev.side, prev.size, prev.entry_price) == (side, size, entry_price):
+            prev.last_update_ms = now
+            self._mark_dirty()
+            return prev
 
         self.position = PositionState(
             symbol=self.symbol,
             side=side,
             size=size,
             entry_price=entry_price,
-            opened_at_ms=opened_at,
+            opened_at_ms=prev.opened_at_ms if prev else now,
             last_update_ms=now,
-            last_order_id=self.position.last_order_id if self.position else None,
-            last_close_order_id=self.position.last_close_order_id if self.position else None,
+            last_order_id=prev.last_order_id if prev else None,
+            last_close_order_id=prev.last_close_order_id if prev else None,
         )
 
+        # a real change (new/resized position) persists immediately
         self.save()
         return self.position
 
@@ -1,13 +1,19 @@
+import logging
 import os
 import time
 import hmac
 import hashlib
-import base64
+import binascii
 import json
-import base64
-import requests
 from dotenv import load_dotenv
 
+# orjson serializes straight to compact bytes (~3-10x faster than stdlib
+# json) — those exact bytes are both signed and sent, so no re-encode.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ============================================================
 # LOAD ENV
 # ============================================================
@@ -29,47 +35,63 @@ BASE_URL = "https://api-contract.weex.com"
 PATH = "/capi/v2/order/uploadAiLog"
 METHOD = "POST"
 
-
-# ------------------------
-# SIGNING (BASE64 HMAC-SHA256 ✅)
-# message = timestamp + METHOD + path + body
-# ------------------------
-def sign(timestamp: str, method: str, path: str, body: str = "") -> str:
-    message = f"{timestamp}{method.upper()}{path}{body}"
-    digest = hmac.new(
-        API_SECRET.encode("utf-8"),
-        message.encode("utf-8"),
-        hashlib.sha256
-    ).digest()
-    return base64.b64encode(digest).decode("utf-8")
-
-
-def build_headers(method: str, path: str, body: str = "") -> dict:
-    ts = str(int(time.time() * 1000))
-    return {
-        "ACCESS-KEY": API_KEY,
-        "ACCESS-SIGN": sign(ts, method, path, body),
-        "ACCESS-TIMESTAMP": ts,
-        "ACCESS-PASSPHRASE": API_PASSPHRASE,
-        "locale": "en-US",
-        "Content-Type": "application/json"
-    }
+# Lazy %s formatting — header/payload dumps (which carry the signature)
+# stay at DEBUG and cost nothing unless that level is enabled
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+# Encoded once at module load — not per signature
+_SECRET_BYTES = API_SECRET.encode("utf-8")
+# b2a_base64 is what base64.b64encode wraps — calling it directly (with
+# newline suppressed) skips one Python frame per signature
+_b2a_base64 = binascii.b2a_base64
+_METHOD_PATH_BYTES = (METHOD + PATH).encode("utf-8")
+
+# Keyed HMAC context built once — per-signature copies skip re-deriving
+# the 64-byte ipad/opad key blocks.
+_HMAC_TEMPLATE = hmac.new(_SECRET_BYTES, None, hashlib.sha256)
+
+# Persistent session: keep-alive reuses one TLS connection across uploads
+# instead of a full DNS+TCP+TLS handshake per log. Built lazily so that
+# `import weex.upload_ai_log` for offline signing/header building skips
+# the requests import (~30 ms cold) entirely.
+_SESSION = None
+
+
+def _get_session():
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter, Retry
+
+        _SESSION = requests.Session()
+        _SESSION.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=16,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                ),
+            ),
+        )
+    return _SESSION
 
 
-# ------------------------
-# UPLOAD FUNCTION (dynamic orderId ✅)
-# ------------------------
-def upload_ai_log(ai_log: dict):
-    path = "/capi/v2/order/uploadAiLog"
-    url = BASE_URL + path
+def _dump_body(ai_log: dict) -> bytes:
+    """Compact JSON bytes for signing + sending."""
+    if orjson is not None:
+        # handles numpy scalars/arrays and int keys natively — callers can
+        # pass np.float64 confidences without defensive float() casts
+        return orjson.dumps(
+            ai_log,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC,
+        )
+    return json.dumps(ai_log, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
 
-    body_json = json.dumps(ai_log, separators=(",", ":"))
-    headers = build_headers("POST", path, body_json)
 
-    print("\n🚀 Uploading AI Log")
-    print("➡️ URL:", url)
-    print("➡️ ORDER ID:", ai_log.get("orderId"))
-    print("➡️ PAYLOAD:", body_json)
 # ============================================================
 # AI LOG PAYLOAD
 # ============================================================
@@ -108,55 +130,61 @@ AI_LOG = {
 # SIGNATURE (BASE64 — REQUIRED)
 # ============================================================
 
-def generate_signature(timestamp: str, body: str) -> str:
-    payload = f"{timestamp}{METHOD}{PATH}{body}"
-    print("🔑 Signing payload:", payload)
-
-    signature = hmac.new(
-        API_SECRET.encode("utf-8"),
-        payload.encode("utf-8"),
-        hashlib.sha256
-    ).digest()
+def generate_signature(timestamp: str, body: bytes) -> str:
+    # Incremental HMAC updates — no large timestamp+method+path+body
+    # intermediate string is ever built.
+    h = _HMAC_TEMPLATE.copy()
+    h.update(timestamp.encode())
+    h.update(_METHOD_PATH_BYTES)
+    h.update(body)
+    return _b2a_base64(h.digest(), newline=False).decode("ascii")
+
+# Static header fields built once — per upload we copy and patch the three
+# variable fields instead of rebuilding the full literal
+_HEADERS_TEMPLATE = {
+    "ACCESS-KEY": API_KEY,
+    "ACCESS-SIGN": "",
+    "ACCESS-TIMESTAMP": "",
+    "ACCESS-PASSPHRASE": API_PASSPHRASE,
+    "locale": "zh-CN",
+    "Content-Type": "application/json",
+    "Content-Length": "",
+}
 
-    return base64.b64encode(signature).decode()
 
-def build_headers(body: str):
-    ts = str(int(time.time() * 1000))
-    sign = generate_signature(ts, body)
+def build_headers(body: bytes):
+    ts = str(time.time_ns() // 1_000_000)
 
-    headers = {
-        "ACCESS-KEY": API_KEY,
-        "ACCESS-SIGN": sign,
-        "ACCESS-TIMESTAMP": ts,
-        "ACCESS-PASSPHRASE": API_PASSPHRASE,
-        "locale": "zh-CN",
-        "Content-Type": "application/json"
-    }
+    headers = _HEADERS_TEMPLATE.copy()
+    headers["ACCESS-SIGN"] = generate_signature(ts, body)
+    headers["ACCESS-TIMESTAMP"] = ts
+    # already known — saves requests probing the buffer
+    headers["Content-Length"] = str(len(body))
 
-    print("📝 Headers:", headers)
+    log.debug("📝 Headers: %s", headers)
     return headers
 
 # ============================================================
 # UPLOAD
 # ============================================================
 
-def upload_ai_log():
-    body = json.dumps(AI_LOG, separators=(",", ":"), ensure_ascii=False)
+def upload_ai_log(ai_log: dict = None):
+    body = _dump_body(ai_log if ai_log is not None else AI_LOG)
     headers = build_headers(body)
 
     url = BASE_URL + PATH
 
-    print("\n🚀 Uploading AI Log")
-    print("➡️ URL:", url)
-    print("➡️ Payload:", body)
+    log.info("🚀 Uploading AI Log")
+    log.debug("➡️ URL: %s", url)
+    log.debug("➡️ Payload: %s", body)
 
-    response = requests.post(url, headers=headers, data=body, timeout=15)
+    response = _get_session().post(url, headers=headers, data=body, timeout=15)
 
-    print("⬅️ STATUS:", response.status_code)
-    print("⬅️ RESPONSE:", response.text)
+    log.info("⬅️ STATUS: %s", response.status_code)
+    log.debug("⬅️ RESPONSE: %s", response.text)
 
     response.raise_for_status()
-    return response.json()
+    return orjson.loads(response.content) if orjson is not None else response.json()
 
 
 # ------------------------
@@ -167,38 +195,12 @@ def upload_ai_log():
 # ============================================================
 
 if __name__ == "__main__":
-    AI_LOG = {
-        "orderId": 702628302073888771,
-        "stage": "Decision Making",
-        "model": "OmniQuantAI-v0.1",
-        "input": {
-            "prompt": "Analyze BTCUSDT perpetual futures market conditions and determine trade direction.",
-            "data": {
-                "symbol": "cmt_btcusdt",
-                "last_price": 91358.1,
-                "mark_price": 91364.6,
-                "index_price": 91407.677,
-                "volume_24h": 2862623799.40485
-            }
-        },
-        "output": {
-            "signal": "OPEN_LONG",
-            "confidence": 0.78,
-            "execution": {
-                "order_type": "IOC",
-                "side": "BUY",
-                "size": "0.001",
-                "symbol": "cmt_btcusdt"
-            }
-        },
-        "explanation": (
-            "The AI agent evaluated real-time futures features (price, spread, "
-            "volume, mark/index deviation) and approved a controlled long entry "
-            "under risk constraints."
-        )
-    }
-
+    logging.basicConfig(
+        level=logging.DEBUG if os.getenv("WEEX_DEBUG") == "1" else logging.INFO,
+        format="%(message)s",
+    )
     try:
+        # sample AI_LOG defined at module level — one literal, not two
         result = upload_ai_log(AI_LOG)
         print("\n✅ AI LOG UPLOAD SUCCESS")
         print(result)